@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark af hukommelsesforbrug for URL og resultat records.
+
+Sammenligner de tidligere dictionaries med UrlRecord og DownloadResult for et
+antal rækker, målt med tracemalloc. Både det samlede forbrug (inkl. URL
+strengene) og forbruget for resultaterne alene vises.
+
+Brug:
+    python -m benchmarks.bench_records --rows 1000000
+
+Køres fra pdf-downloader mappen, så src pakken kan importeres.
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from src.records import DownloadResult, UrlRecord
+
+ERRORS = ['HTTP 404', 'HTTP 503', 'Non-PDF content (text/html)', 'TimeoutError']
+
+
+def build_dicts(rows):
+    """
+    Bygger URL og resultat dictionaries som før records blev indført.
+    """
+    results = []
+    for i in range(rows):
+        url_info = {
+            'primary_url': f"https://example{i % 500}.com/reports/{i}.pdf",
+            'alternative_url': f"https://example{i % 500}.com/html/{i}",
+            'br_number': f"BR{i:08d}"
+        }
+        results.append({
+            'br_number': url_info['br_number'],
+            'primary_url': url_info['primary_url'],
+            'alternative_url': url_info['alternative_url'],
+            'status': 'failed',
+            'error_message': '; '.join([ERRORS[i % 4], ERRORS[(i + 1) % 4]]),
+            'timestamp': time.strftime('%Y-%m-%d %H:%M:%S')
+        })
+    return results
+
+
+def build_records(rows):
+    """
+    Bygger de samme data som UrlRecord og DownloadResult.
+    """
+    results = []
+    for i in range(rows):
+        url_info = UrlRecord(
+            br_number=f"BR{i:08d}",
+            primary_url=f"https://example{i % 500}.com/reports/{i}.pdf",
+            alternative_url=f"https://example{i % 500}.com/html/{i}"
+        )
+        result = DownloadResult(url_info, created_at=time.time())
+        result['error_message'] = '; '.join([ERRORS[i % 4], ERRORS[(i + 1) % 4]])
+        results.append(result)
+    return results
+
+
+def measure(builder, *args):
+    """
+    Returnerer allokeret hukommelse i bytes mens resultatet holdes i live.
+    """
+    tracemalloc.start()
+    results = builder(*args)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del results
+    return current
+
+
+def results_only(kind, rows):
+    """
+    Måler kun resultaterne; URL informationen bygges før målingen starter.
+    """
+    if kind == 'dicts':
+        urls = [{'primary_url': f"https://example.com/{i}.pdf", 'alternative_url': None,
+                 'br_number': f"BR{i:08d}"} for i in range(rows)]
+
+        def build():
+            return [{
+                'br_number': u['br_number'], 'primary_url': u['primary_url'],
+                'alternative_url': u['alternative_url'], 'status': 'success',
+                'error_message': '', 'timestamp': time.strftime('%Y-%m-%d %H:%M:%S')
+            } for u in urls]
+    else:
+        urls = [UrlRecord(f"BR{i:08d}", f"https://example.com/{i}.pdf", None) for i in range(rows)]
+
+        def build():
+            return [DownloadResult(u, created_at=time.time()) for u in urls]
+    return measure(build)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Mål hukommelse for URL og resultat records')
+    parser.add_argument('--rows', type=int, default=100000, help='Antal rækker (default: 100000)')
+    args = parser.parse_args()
+
+    for title, dicts, records in [
+        ('total', measure(build_dicts, args.rows), measure(build_records, args.rows)),
+        ('results', results_only('dicts', args.rows), results_only('records', args.rows)),
+    ]:
+        print(f"{title:<10} dicts {dicts / args.rows:6.0f} bytes/row   "
+              f"records {records / args.rows:6.0f} bytes/row   {dicts / records:5.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark af opstartstid for PDF Downloader.
+
+Måler hvor lang tid det tager at importere CLI'en og hvert af de tunge moduler
+i en frisk Python proces, samt den samlede tid for `python main.py --help`.
+
+Brug:
+    python benchmarks/bench_startup.py --runs 10
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Moduler der måles hver for sig
+MODULES = [
+    'src.cli',
+    'src.excel_handler',
+    'src.downloader',
+    'src.status_tracker',
+]
+
+
+def time_command(command, runs):
+    """
+    Kører en kommando flere gange og returnerer median varighed i millisekunder.
+    """
+    durations = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run(command, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        durations.append((time.perf_counter() - started) * 1000)
+    return statistics.median(durations)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Mål opstartstid for PDF Downloader')
+    parser.add_argument('--runs', type=int, default=5, help='Antal gentagelser pr. måling (default: 5)')
+    args = parser.parse_args()
+
+    baseline = time_command([sys.executable, '-c', 'pass'], args.runs)
+    print(f"{'python -c pass':<30} {baseline:8.1f} ms")
+
+    for module in MODULES:
+        duration = time_command([sys.executable, '-c', f'import {module}'], args.runs)
+        print(f"{'import ' + module:<30} {duration:8.1f} ms  (+{duration - baseline:.1f} ms)")
+
+    duration = time_command([sys.executable, 'main.py', '--help'], args.runs)
+    print(f"{'main.py --help':<30} {duration:8.1f} ms  (+{duration - baseline:.1f} ms)")
+
+
+if __name__ == '__main__':
+    main()
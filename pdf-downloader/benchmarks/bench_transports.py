@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark af aiohttp (HTTP/1.1) mod HTTP/2 transporten.
+
+Downloader den samme liste af URLs to gange, først kun med aiohttp og derefter
+med HTTP/2 slået til for hosts der forhandler h2, og sammenligner tid og
+gennemstrømning. Kræver netværksadgang og `pip install 'httpx[http2]'`.
+
+Brug:
+    python -m benchmarks.bench_transports --urls urls.txt --max-concurrent 50
+
+Køres fra pdf-downloader mappen, så src pakken kan importeres.
+"""
+
+import argparse
+import asyncio
+import logging
+import tempfile
+import time
+from pathlib import Path
+
+from src.downloader import PDFDownloader
+from src.transports import Http2Transport
+
+
+def read_urls(path):
+    """
+    Læser én URL pr. linje og laver URL information dictionaries.
+    """
+    lines = [line.strip() for line in Path(path).read_text(encoding='utf-8').splitlines()]
+    return [
+        {'br_number': f'bench{i}', 'primary_url': url, 'alternative_url': None}
+        for i, url in enumerate(line for line in lines if line)
+    ]
+
+
+async def run_once(urls, max_concurrent, timeout, use_http2):
+    """
+    Kører én download af alle URLs og returnerer målinger.
+    """
+    http2 = Http2Transport(max_connections=max_concurrent) if use_http2 else None
+    with tempfile.TemporaryDirectory() as output_dir:
+        downloader = PDFDownloader(output_dir, max_concurrent, timeout, http2=http2)
+        started = time.perf_counter()
+        results = await downloader.download_pdfs(urls)
+        elapsed = time.perf_counter() - started
+        size = sum(f.stat().st_size for f in Path(output_dir).glob('*.pdf'))
+    h2_hosts = 0
+    if http2:
+        h2_hosts = sum(1 for protocol in http2.protocols.values() if protocol == 'h2')
+        await http2.close()
+    return {
+        'elapsed': elapsed,
+        'success': sum(1 for r in results if r['status'] == 'success'),
+        'megabytes': size / 1024 / 1024,
+        'h2_hosts': h2_hosts
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Sammenlign aiohttp og HTTP/2 transport')
+    parser.add_argument('--urls', required=True, help='Fil med én URL pr. linje')
+    parser.add_argument('--max-concurrent', type=int, default=50,
+                        help='Maksimalt antal samtidige downloads (default: 50)')
+    parser.add_argument('--timeout', type=int, default=30,
+                        help='Timeout i sekunder for hver download (default: 30)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+    urls = read_urls(args.urls)
+    for name, use_http2 in (('aiohttp', False), ('http2', True)):
+        stats = asyncio.run(run_once(urls, args.max_concurrent, args.timeout, use_http2))
+        print(
+            f"{name:<8} {stats['elapsed']:8.2f} s  {stats['success']:5d}/{len(urls)} ok  "
+            f"{stats['megabytes'] / stats['elapsed']:7.2f} MB/s  h2 hosts: {stats['h2_hosts']}"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,24 @@
+"""
+PDF Downloader pakken.
+
+Hovedklasserne kan importeres direkte fra pakken, men modulerne indlæses
+først ved første opslag, så `import src` ikke trækker pandas og aiohttp ind.
+"""
+
+import importlib
+
+_EXPORTS = {
+    'ExcelHandler': 'excel_handler',
+    'PDFDownloader': 'downloader',
+    'StatusTracker': 'status_tracker',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(f'.{module_name}', __name__)
+    return getattr(module, name)
@@ -0,0 +1,7 @@
+"""
+Gør det muligt at køre PDF Downloader med `python -m src`.
+"""
+
+from .cli import run
+
+run()
@@ -0,0 +1,312 @@
+# -*- coding: utf-8 -*-
+
+"""
+PDF Downloader - Kommandolinje
+
+Dette modul koordinerer processen med at downloade PDF-rapporter fra en Excel-fil.
+Det håndterer:
+- Læsning af URLs fra Excel
+- Asynkron nedlasting af PDFs
+- Status tracking og rapportering
+- Fejlhåndtering og logging
+- Generering af metadata i samme format som Metadata2006_2016.xlsx
+
+Tunge afhængigheder (pandas, aiohttp, tqdm og asyncio) importeres først inde i
+main(), så `--help` og argumentfejl ikke betaler for at indlæse dem.
+
+Brug:
+    python -m src --excel "sti/til/excel.xlsx" --output "sti/til/output" --report "sti/til/reports"
+"""
+
+import argparse
+import logging
+from pathlib import Path
+from datetime import datetime
+import sys
+import os
+
+def setup_logging():
+    """
+    Opsætter logging systemet med både fil og konsol output.
+    """
+    # Opret logs mappe hvis den ikke findes
+    log_dir = Path('logs')
+    log_dir.mkdir(exist_ok=True)
+    
+    # Generer timestamp for log filnavn
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    log_file = log_dir / f'pdf_downloader_{timestamp}.log'
+    
+    # Konfigurer logging format
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler(log_file),
+            logging.StreamHandler()
+        ]
+    )
+
+def parse_arguments(argv=None):
+    """
+    Parser kommandolinje argumenter.
+    
+    Args:
+        argv (List[str], optional): Argumenter der parses i stedet for sys.argv
+        
+    Returns:
+        argparse.Namespace: Parsede argumenter
+    """
+    parser = argparse.ArgumentParser(description='Download PDF rapporter fra Excel fil')
+    
+    # Påkrævede argumenter
+    parser.add_argument('--excel', required=True, help='Sti til Excel fil med URLs')
+    parser.add_argument('--output', required=True, help='Mappe hvor PDFs skal gemmes')
+    parser.add_argument('--report', required=True, help='Mappe hvor status rapporter skal gemmes')
+    
+    # Valgfrie argumenter
+    parser.add_argument('--max-concurrent', type=int, default=10,
+                      help='Maksimalt antal samtidige downloads (default: 10)')
+    parser.add_argument('--limit', type=int, default=10,
+                      help='Maksimalt antal succesfulde downloads (default: 10)')
+    parser.add_argument('--timeout', type=int, default=30,
+                      help='Timeout i sekunder for hver download (default: 30)')
+    parser.add_argument('--host-state', default=None,
+                      help='JSON fil med host helbred mellem kørsler (default: <report>/host_health.json)')
+    parser.add_argument('--breaker-threshold', type=int, default=5,
+                      help='Fortløbende connect-fejl før en host springes over (default: 5)')
+    parser.add_argument('--breaker-cooldown', type=float, default=300,
+                      help='Sekunder før en død host probes igen (default: 300)')
+    parser.add_argument('--dns-ttl', type=float, default=300,
+                      help='Sekunder et DNS opslag caches (default: 300)')
+    parser.add_argument('--redirect-cache', default=None,
+                      help='JSON fil med cachede redirects (default: <report>/redirect_cache.json)')
+    parser.add_argument('--redirect-ttl-days', type=float, default=30,
+                      help='Dage en cachet redirect er gyldig (default: 30)')
+    parser.add_argument('--io-workers', type=int, default=4,
+                      help='Antal tråde til skrivning og sha256 (default: 4)')
+    parser.add_argument('--validate-pdf', action='store_true',
+                      help='Valider PDF strukturen før en fil accepteres')
+    parser.add_argument('--validate-processes', type=int, default=0,
+                      help='Antal processer til PDF validering, 0 bruger tråde (default: 0)')
+    parser.add_argument('--layout', choices=['flat', 'hash', 'year'], default='flat',
+                      help='Mappe layout for PDFs: flat, hash-prefix eller år (default: flat)')
+    parser.add_argument('--year-column', default=None,
+                      help='Kolonne med rapportens år, bruges af --layout year')
+    parser.add_argument('--pack', action='store_true',
+                      help='Pak PDFs i rullende tar shards med en indeksfil i stedet for løse filer')
+    parser.add_argument('--shard-size-mb', type=int, default=1024,
+                      help='Maksimal størrelse af en tar shard i MB (default: 1024)')
+    parser.add_argument('--extract-info', action='store_true',
+                      help='Udtræk sideantal, PDF version, kryptering og første sides tekst til metadata')
+    parser.add_argument('--extract-processes', type=int, default=2,
+                      help='Antal processer til udtrækning af PDF information (default: 2)')
+    parser.add_argument('--report-format', choices=['xlsx', 'csv', 'parquet'], default='xlsx',
+                      help='Format for status rapport og metadata (default: xlsx)')
+    parser.add_argument('--xlsx-export', action='store_true',
+                      help='Skriv også status rapporten som xlsx når et andet format bruges')
+    parser.add_argument('--rerun-from', default=None,
+                      help='Tidligere download_status rapport; kun dens rækker forsøges igen')
+    parser.add_argument('--rerun-status', default='failed',
+                      help='Kommasepareret liste af statusser der genkøres (default: failed)')
+    parser.add_argument('--rerun-error-class', default=None,
+                      help='Kommasepareret liste af fejlklasser, fx timeout,http_5xx')
+    parser.add_argument('--rerun-host', default=None,
+                      help='Kommasepareret liste af hosts der genkøres')
+    parser.add_argument('--http2', action='store_true',
+                      help='Brug HTTP/2 (httpx) til hosts der understøtter det via ALPN')
+    parser.add_argument('--insecure-hosts', default=None,
+                      help='Kommasepareret liste af hosts hvor certifikatet ikke verificeres')
+    parser.add_argument('--proxy', default=None,
+                      help='Kommasepareret liste af HTTP eller SOCKS proxies, fx http://10.0.0.1:3128')
+    parser.add_argument('--proxy-file', default=None,
+                      help='Tekstfil med én proxy URL pr. linje')
+    parser.add_argument('--proxy-policy', choices=['least_loaded', 'sticky'], default='least_loaded',
+                      help='Fordeling af requests på proxies: least_loaded eller sticky pr. host (default: least_loaded)')
+    parser.add_argument('--proxy-cooldown', type=float, default=60,
+                      help='Sekunder en fejlende proxy er ude af puljen (default: 60)')
+    parser.add_argument('--proxy-max-failures', type=int, default=3,
+                      help='Fortløbende proxy fejl før proxyen tages ud af puljen (default: 3)')
+    
+    return parser.parse_args(argv)
+
+def _split_list(value):
+    """
+    Deler en kommasepareret argumentværdi op i en liste, eller None hvis den er tom.
+    """
+    if not value:
+        return None
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+def validate_paths(args):
+    """
+    Validerer at alle angivne stier eksisterer og er tilgængelige.
+    
+    Args:
+        args (argparse.Namespace): Parsede argumenter
+        
+    Raises:
+        FileNotFoundError: Hvis en sti ikke findes
+        PermissionError: Hvis der ikke er adgang til en sti
+    """
+    # Tjek Excel fil
+    if not os.path.exists(args.excel):
+        raise FileNotFoundError(f"Excel fil ikke fundet: {args.excel}")
+    
+    # Opret output mappe hvis den ikke findes
+    os.makedirs(args.output, exist_ok=True)
+    
+    # Opret report mappe hvis den ikke findes
+    os.makedirs(args.report, exist_ok=True)
+
+async def main(args):
+    """
+    Hovedfunktion der koordinerer hele download processen.
+    
+    Args:
+        args (argparse.Namespace): Parsede argumenter
+    """
+    try:
+        logging.info("Starter PDF Downloader")
+        validate_paths(args)
+        
+        # Komponenterne importeres først her, så CLI'en starter hurtigt
+        from .excel_handler import ExcelHandler
+        from .downloader import PDFDownloader
+        from .status_tracker import StatusTracker
+        from .host_health import HostHealthTracker
+        from .dns_cache import CachingResolver
+        from .io_stage import IOStage, LoopLagMonitor
+        from .transports import Http2Transport
+        from .storage import PDFStore
+        from .redirect_cache import RedirectCache
+        from .tls import ConnectionStats
+        from .proxy_pool import ProxyPool, load_proxy_list
+        
+        # Initialiser komponenter
+        excel_handler = ExcelHandler(args.excel, year_column=args.year_column)
+        host_health = HostHealthTracker(
+            args.host_state or os.path.join(args.report, 'host_health.json'),
+            failure_threshold=args.breaker_threshold,
+            cooldown=args.breaker_cooldown
+        )
+        resolver = CachingResolver(ttl=args.dns_ttl)
+        io_stage = IOStage(
+            max_workers=args.io_workers,
+            max_pending=args.max_concurrent * 2,
+            validate_pdfs=args.validate_pdf,
+            validate_processes=args.validate_processes
+        )
+        store = PDFStore(args.output, layout=args.layout, packed=args.pack,
+                         shard_size=args.shard_size_mb * 1024 * 1024)
+        redirect_cache = RedirectCache(
+            args.redirect_cache or os.path.join(args.report, 'redirect_cache.json'),
+            ttl=args.redirect_ttl_days * 24 * 3600
+        )
+        post_processor = None
+        if args.extract_info:
+            # pdf_processing indlæser pypdf, så den importeres kun når den bruges
+            from .pdf_processing import PDFProcessingStage
+            post_processor = PDFProcessingStage(processes=args.extract_processes,
+                                                max_pending=args.max_concurrent * 2)
+        http2 = Http2Transport(max_connections=args.max_concurrent) if args.http2 else None
+        connection_stats = ConnectionStats()
+        proxies = (_split_list(args.proxy) or []) + (load_proxy_list(args.proxy_file) if args.proxy_file else [])
+        proxy_pool = None
+        if proxies:
+            proxy_pool = ProxyPool(proxies, policy=args.proxy_policy, cooldown=args.proxy_cooldown,
+                                   max_failures=args.proxy_max_failures)
+            logging.info(f"Using {len(proxy_pool.proxies)} proxies ({args.proxy_policy})")
+        downloader = PDFDownloader(args.output, args.max_concurrent, args.timeout,
+                                   host_health=host_health, resolver=resolver, io_stage=io_stage,
+                                   http2=http2, store=store, redirect_cache=redirect_cache,
+                                   post_processor=post_processor,
+                                   insecure_hosts=_split_list(args.insecure_hosts),
+                                   connection_stats=connection_stats, proxy_pool=proxy_pool)
+        status_tracker = StatusTracker(args.report, report_format=args.report_format)
+        
+        # Komponenterne lukkes og gemmes også ved fejl og Ctrl-C, så fx en pakket
+        # shard afsluttes og indeksfilen ikke mister linjer
+        loop_lag = LoopLagMonitor()
+        try:
+            # Hent URLs fra Excel, eventuelt kun dem der skal genkøres
+            br_numbers = None
+            if args.rerun_from:
+                from .rerun import load_status_report, select_for_rerun
+                br_numbers = select_for_rerun(
+                    load_status_report(args.rerun_from),
+                    statuses=_split_list(args.rerun_status),
+                    error_classes=_split_list(args.rerun_error_class),
+                    hosts=_split_list(args.rerun_host)
+                )
+                if not br_numbers:
+                    logging.info("Ingen rækker matcher genkørselsfiltrene")
+                    return
+            urls = excel_handler.get_urls(br_numbers=br_numbers)
+            if not urls:
+                logging.error("Ingen URLs fundet i Excel filen")
+                return
+        
+            logging.info(f"Fundet {len(urls)} URLs at downloade")
+            logging.info(f"Downloader maksimalt {args.limit} PDFs")
+        
+            # Start download process
+            loop_lag.start()
+            results = await downloader.download_pdfs(urls, limit=args.limit)
+        finally:
+            await loop_lag.stop()
+            loop_lag.log()
+            connection_stats.log()
+            if proxy_pool:
+                proxy_pool.log()
+            io_stage.close()
+            store.close()
+            if post_processor:
+                post_processor.close()
+            host_health.save()
+            redirect_cache.save()
+            await resolver.close()
+            if http2:
+                await http2.close()
+        
+        # Generer og gem metadata
+        metadata = excel_handler.generate_metadata(
+            results, pdf_info=post_processor.results if post_processor else None
+        )
+        metadata_path = os.path.join(
+            args.report, f'metadata_{datetime.now().strftime("%Y%m%d_%H%M%S")}.{args.report_format}'
+        )
+        excel_handler.save_metadata(metadata, metadata_path)
+        
+        # Generer status rapport
+        status_tracker.update_batch(results)
+        if proxy_pool:
+            status_tracker.update_proxy_stats(proxy_pool.stats())
+        status_tracker.generate_report(xlsx_export=args.xlsx_export)
+        
+        # Log afslutning
+        successful = sum(1 for r in results if r['status'] in ['success', 'success_alternative'])
+        logging.info(f"Download process afsluttet. {successful} PDFs downloadet succesfuldt.")
+        
+    except Exception as e:
+        logging.error(f"Fejl under kørsel: {str(e)}")
+        raise
+
+def run(argv=None):
+    """
+    Entry point for kommandolinjen.
+    
+    Args:
+        argv (List[str], optional): Argumenter der parses i stedet for sys.argv
+    """
+    # Argumenter parses før logging opsættes, så --help ikke opretter en log fil
+    args = parse_arguments(argv)
+    setup_logging()
+    import asyncio
+    try:
+        asyncio.run(main(args))
+    except KeyboardInterrupt:
+        logging.info("Program afbrudt af brugeren")
+    except Exception as e:
+        logging.error(f"Uventet fejl: {str(e)}")
+        sys.exit(1)
@@ -0,0 +1,161 @@
+import asyncio
+import logging
+import socket
+import time
+from typing import Dict, Iterable, List, Set, Tuple
+
+from aiohttp.abc import AbstractResolver
+from aiohttp.resolver import AsyncResolver, ThreadedResolver, aiodns_default
+
+# getaddrinfo fejlkoder der betyder at navnet ikke findes (NXDOMAIN)
+NXDOMAIN_ERRORS = {
+    getattr(socket, name) for name in ('EAI_NONAME', 'EAI_NODATA') if hasattr(socket, name)
+}
+
+
+class CachingResolver(AbstractResolver):
+    """
+    Asynkron DNS resolver med en delt cache der udløber efter TTL.
+
+    Bruger aiodns (AsyncResolver) hvis det er installeret, ellers aiohttp's
+    trådbaserede resolver. Samtidige opslag på den samme host deles, så hver
+    host kun slås op én gang, og fejlede opslag caches kortere tid.
+
+    Attributes:
+        ttl (float): Sekunder et succesfuldt opslag caches
+        negative_ttl (float): Sekunder et fejlet opslag caches
+        failed_hosts (Set[str]): Hosts der ikke kunne resolves (NXDOMAIN)
+    """
+
+    def __init__(self, ttl: float = 300, negative_ttl: float = 60, resolver: AbstractResolver = None):
+        """
+        Initialiserer CachingResolver.
+
+        Args:
+            ttl (float): Sekunder et succesfuldt opslag caches
+            negative_ttl (float): Sekunder et fejlet opslag caches
+            resolver (AbstractResolver, optional): Underliggende resolver
+        """
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.failed_hosts: Set[str] = set()
+        self._resolver = resolver
+        self._cache: Dict[Tuple[str, int], Tuple[float, object]] = {}
+        self._inflight: Dict[Tuple[str, int], asyncio.Future] = {}
+
+    def _get_resolver(self) -> AbstractResolver:
+        """
+        Opretter den underliggende resolver inde i det kørende event loop.
+        """
+        if self._resolver is None:
+            if aiodns_default:
+                self._resolver = AsyncResolver()
+            else:
+                logging.warning("aiodns is not installed; falling back to threaded DNS lookups "
+                                "(pip install aiodns)")
+                self._resolver = ThreadedResolver()
+        return self._resolver
+
+    async def resolve(self, host: str, port: int = 0,
+                      family: socket.AddressFamily = socket.AF_INET) -> List[Dict]:
+        """
+        Slår en host op via cachen.
+
+        Args:
+            host (str): Hostnavn
+            port (int): Port der sættes på resultaterne
+            family (socket.AddressFamily): Adressefamilie
+
+        Returns:
+            List[Dict]: aiohttp ResolveResult dictionaries
+
+        Raises:
+            OSError: Hvis hosten ikke kan resolves
+        """
+        key = (host, int(family))
+        cached = self._cache.get(key)
+        if cached and cached[0] > time.monotonic():
+            entries = cached[1]
+        else:
+            future = self._inflight.get(key)
+            if future is None:
+                future = asyncio.ensure_future(self._lookup(host, family))
+                self._inflight[key] = future
+                future.add_done_callback(lambda _: self._inflight.pop(key, None))
+            entries = await asyncio.shield(future)
+
+        if isinstance(entries, OSError):
+            # Hver kalder får sin egen fejl, så den cachede fejls traceback ikke deles og vokser
+            raise type(entries)(*entries.args) from entries
+        # Cachen er uafhængig af port, så porten sættes på pr. kald
+        return [{**entry, 'port': port} for entry in entries]
+
+    async def _lookup(self, host: str, family: socket.AddressFamily):
+        """
+        Udfører et egentligt opslag og gemmer resultatet i cachen.
+
+        Returns:
+            List[Dict] eller OSError: Resultater, eller fejlen hvis opslaget fejlede
+        """
+        key = (host, int(family))
+        try:
+            entries = await self._get_resolver().resolve(host, 0, family)
+        except OSError as e:
+            if self._is_nxdomain(e):
+                self.failed_hosts.add(host)
+            self._cache[key] = (time.monotonic() + self.negative_ttl, e)
+            logging.warning(f"DNS lookup failed for {host}: {e}")
+            return e
+        self.failed_hosts.discard(host)
+        self._cache[key] = (time.monotonic() + self.ttl, entries)
+        return entries
+
+    @staticmethod
+    def _is_nxdomain(error: OSError) -> bool:
+        """
+        Afgør om en opslagsfejl betyder at navnet ikke findes.
+
+        Midlertidige fejl (fx EAI_AGAIN) tæller ikke, så hosten kan forsøges igen.
+        """
+        if isinstance(error, socket.gaierror):
+            return error.errno in NXDOMAIN_ERRORS
+        # AsyncResolver pakker aiodns fejl ind i OSError uden errno
+        message = str(error).lower()
+        return 'not found' in message or 'does not exist' in message or 'nxdomain' in message
+
+    async def pre_resolve(self, hosts: Iterable[str], concurrency: int = 100) -> Set[str]:
+        """
+        Resolver alle hosts samtidigt før downloads starter.
+
+        Args:
+            hosts (Iterable[str]): Unikke hostnavne
+            concurrency (int): Maksimalt antal samtidige opslag
+
+        Returns:
+            Set[str]: Hosts der ikke findes (NXDOMAIN)
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def resolve_one(host):
+            async with semaphore:
+                try:
+                    await self.resolve(host, 0, socket.AF_UNSPEC)
+                except OSError:
+                    pass
+
+        hosts = [host for host in set(hosts) if host]
+        started = time.monotonic()
+        await asyncio.gather(*(resolve_one(host) for host in hosts))
+        logging.info(
+            f"Pre-resolved {len(hosts)} hosts in {time.monotonic() - started:.1f}s, "
+            f"{len(self.failed_hosts)} not found"
+        )
+        return set(self.failed_hosts)
+
+    async def close(self) -> None:
+        """
+        Lukker den underliggende resolver.
+        """
+        if self._resolver is not None:
+            await self._resolver.close()
+            self._resolver = None
@@ -6,6 +6,16 @@ import logging
 from typing import List, Dict
 from tqdm import tqdm
 import time
+from .transports import http2_connect_errors
+from .storage import PDFStore
+from .utils import get_host
+from .records import DownloadResult
+from .tls import create_ssl_context, host_matches
+from .proxy_pool import proxy_errors, is_proxy_failure, is_target_failure
+
+# Fejl der tæller som connect-fejl eller timeout i host circuit breakeren. httpx
+# fejl lægges til når HTTP/2 backenden er importeret, se http2_connect_errors
+CONNECT_ERRORS = (aiohttp.ClientConnectionError, asyncio.TimeoutError)
 
 class PDFDownloader:
     """
@@ -15,9 +25,22 @@ class PDFDownloader:
         output_dir (Path): Sti til output directory
         max_concurrent (int): Maksimalt antal samtidige downloads
         timeout (int): Timeout i sekunder for hver request
+        host_health (HostHealthTracker): Valgfri circuit breaker pr. host
+        resolver (CachingResolver): Valgfri asynkron DNS resolver med cache
+        io_stage (IOStage): Valgfri executor stage til skrivning, hashing og validering
+        http2 (Http2Transport): Valgfri HTTP/2 backend til hosts der forhandler h2
+        store (PDFStore): Bestemmer mappe layout eller pakkede shards for PDFs
+        redirect_cache (RedirectCache): Valgfri cache over endelige URLs efter redirects
+        post_processor (PDFProcessingStage): Valgfri stage der behandler PDFs efter download
+        insecure_hosts (List[str]): Hosts hvor certifikatet ikke verificeres
+        connection_stats (ConnectionStats): Valgfri måling af nye og genbrugte forbindelser
+        proxy_pool (ProxyPool): Valgfri pulje af proxies som requests fordeles over
     """
     
-    def __init__(self, output_dir: str, max_concurrent: int = 10, timeout: int = 30):
+    def __init__(self, output_dir: str, max_concurrent: int = 10, timeout: int = 30,
+                 host_health=None, resolver=None, io_stage=None, http2=None, store=None,
+                 redirect_cache=None, post_processor=None, insecure_hosts=None,
+                 connection_stats=None, proxy_pool=None):
         """
         Initialiserer PDFDownloader.
         
@@ -25,10 +48,41 @@ class PDFDownloader:
             output_dir (str): Sti hvor PDF filer gemmes
             max_concurrent (int): Maksimalt antal samtidige downloads
             timeout (int): Request timeout i sekunder
+            host_health (HostHealthTracker, optional): Circuit breaker der springer
+                døde hosts over i stedet for at vente på timeout
+            resolver (CachingResolver, optional): DNS resolver der bruges af connectoren
+                og til at resolve alle hosts før downloads starter
+            io_stage (IOStage, optional): Flytter skrivning, sha256 og PDF validering
+                væk fra event loopet
+            http2 (Http2Transport, optional): Backend der bruges i stedet for aiohttp
+                til hosts hvor ALPN vælger h2
+            store (PDFStore, optional): Lager for PDFs. Default er et fladt layout
+                i output_dir
+            redirect_cache (RedirectCache, optional): Cache der sender senere forsøg
+                direkte til den endelige URL efter redirects
+            post_processor (PDFProcessingStage, optional): Modtager hver gemt PDF,
+                mens indholdet stadig er i hukommelsen
+            insecure_hosts (List[str], optional): Hosts med ældre certifikater hvor
+                verifikation slås fra. '.example.com' dækker også underdomæner
+            connection_stats (ConnectionStats, optional): Måler nye og genbrugte
+                forbindelser samt TLS handshakes
+            proxy_pool (ProxyPool, optional): Sender requests gennem flere proxies
+                i stedet for én direkte forbindelse
         """
         self.output_dir = Path(output_dir)
         self.max_concurrent = max_concurrent
         self.timeout = timeout
+        self.host_health = host_health
+        self.resolver = resolver
+        self.unresolvable_hosts = set()
+        self.io_stage = io_stage
+        self.http2 = http2
+        self.store = store or PDFStore(output_dir)
+        self.redirect_cache = redirect_cache
+        self.post_processor = post_processor
+        self.insecure_hosts = [host.lower() for host in insecure_hosts or []]
+        self.connection_stats = connection_stats
+        self.proxy_pool = proxy_pool
         self.output_dir.mkdir(parents=True, exist_ok=True)
         
     async def download_pdfs(self, urls: List[Dict], limit: int = None, timeout: int = None) -> List[Dict]:
@@ -46,13 +100,35 @@ class PDFDownloader:
         if timeout:
             self.timeout = timeout
             
+        # Kendte døde hosts fra tidligere kørsler behandles til sidst
+        if self.host_health:
+            urls = self.host_health.prioritize(urls)
+            
         results = []
         tasks = []
         successful_downloads = 0
         
-        # Opret aiohttp session med SSL verifikation deaktiveret for at håndtere ældre certifikater
-        connector = aiohttp.TCPConnector(ssl=False)
-        async with aiohttp.ClientSession(connector=connector) as session:
+        # Resolv alle unikke hosts på én gang, så ukendte domæner fejler uden forbindelse
+        if self.resolver:
+            hosts = {
+                get_host(url_info[key])
+                for url_info in urls
+                for key in ('primary_url', 'alternative_url')
+                if url_info[key]
+            }
+            self.unresolvable_hosts = await self.resolver.pre_resolve(hosts)
+            
+        # Opret aiohttp session med en delt, verificerende SSL context. Hosts med
+        # ældre certifikater slår verifikation fra pr. request via insecure_hosts
+        ssl_context = create_ssl_context()
+        if self.resolver:
+            connector = aiohttp.TCPConnector(ssl=ssl_context, resolver=self.resolver, use_dns_cache=False)
+        else:
+            connector = aiohttp.TCPConnector(ssl=ssl_context)
+        trace_configs = [self.connection_stats.trace_config()] if self.connection_stats else None
+        if self.proxy_pool:
+            self.proxy_pool.open(ssl_context=ssl_context, trace_configs=trace_configs)
+        async with aiohttp.ClientSession(connector=connector, trace_configs=trace_configs) as session:
             with tqdm(total=min(len(urls), limit if limit else len(urls)), 
                      desc="Downloading PDFs") as pbar:
                 
@@ -90,86 +166,297 @@ class PDFDownloader:
                         
                         if limit and successful_downloads >= limit:
                             break
+                            
+        if self.proxy_pool:
+            await self.proxy_pool.close()
+            
+        # Vent på at efterbehandlingen af de sidste PDFs bliver færdig
+        if self.post_processor:
+            await self.post_processor.drain()
                         
         logging.info(f"Download completed. Successfully downloaded {successful_downloads} PDFs")
         return results
     
-    async def download_single(self, session: aiohttp.ClientSession, url_info: Dict) -> Dict:
+    async def download_single(self, session: aiohttp.ClientSession, url_info: Dict) -> DownloadResult:
         """
         Downloader en enkelt PDF fil.
         
         Args:
             session (aiohttp.ClientSession): Aktiv aiohttp session
-            url_info (Dict): URL information dictionary
+            url_info (Dict): URL information (UrlRecord eller dictionary)
             
         Returns:
-            Dict: Download resultat
+            DownloadResult: Download resultat med dict-adgang til felterne
         """
-        result = {
-            'br_number': url_info['br_number'],
-            'primary_url': url_info['primary_url'],
-            'alternative_url': url_info['alternative_url'],
-            'status': 'failed',
-            'error_message': '',
-            'timestamp': time.strftime('%Y-%m-%d %H:%M:%S')
-        }
+        # URL felterne deles med url_info i stedet for at blive kopieret
+        result = DownloadResult(url_info, created_at=time.time())
         
+        pdf_content = None
+        errors = []
         try:
             # Prøv primær URL
             if url_info['primary_url']:
-                pdf_content = await self._try_download(session, url_info['primary_url'])
+                pdf_content = await self._try_download(session, url_info['primary_url'], errors)
                 if pdf_content:
+                    digest = await self._store_pdf(url_info, pdf_content)
                     result['status'] = 'success'
-                    await self._save_pdf(pdf_content, self.output_dir / f"{url_info['br_number']}.pdf")
+                    if digest:
+                        result['sha256'] = digest
                     return result
             
             # Prøv alternativ URL hvis tilgængelig
             if url_info['alternative_url'] and not pdf_content:
-                pdf_content = await self._try_download(session, url_info['alternative_url'])
+                pdf_content = await self._try_download(session, url_info['alternative_url'], errors)
                 if pdf_content:
+                    digest = await self._store_pdf(url_info, pdf_content)
                     result['status'] = 'success_alternative'
-                    await self._save_pdf(pdf_content, self.output_dir / f"{url_info['br_number']}.pdf")
+                    if digest:
+                        result['sha256'] = digest
                     
         except Exception as e:
-            result['error_message'] = str(e)
+            # Fejl ved lagring af en hentet PDF; resultatet forbliver 'failed'
+            errors.append(str(e) or type(e).__name__)
             logging.error(f"Error downloading {url_info['br_number']}: {e}")
         
+        if result['status'] == 'failed':
+            result['error_message'] = '; '.join(errors)
         return result
     
-    async def _try_download(self, session: aiohttp.ClientSession, url: str) -> bytes:
+    def _host_allowed(self, url: str, errors: List[str]) -> bool:
+        """
+        Tjekker DNS resultatet og host circuit breakeren før en URL forsøges.
+        
+        Args:
+            url (str): URL der skal forsøges
+            errors (List[str]): Liste hvor en eventuel afvisning noteres
+            
+        Returns:
+            bool: True hvis URL'en må forsøges
+        """
+        host = get_host(url)
+        if host in self.unresolvable_hosts:
+            errors.append(f"DNS lookup failed for host {host}")
+            logging.info(f"Skipping {url}: {host} does not resolve")
+            return False
+        if not self.host_health or self.host_health.allow_request(host):
+            return True
+        errors.append(f"Circuit open for host {host}")
+        logging.info(f"Skipping {url}: circuit open for {host}")
+        return False
+    
+    async def _try_download(self, session: aiohttp.ClientSession, url: str, errors: List[str] = None) -> bytes:
         """
         Forsøger at downloade fra en URL.
         
+        En cachet endelig URL forsøges før kilde URL'en, så en død link
+        forkorter eller CMS host ikke blokerer en URL der stadig virker. DNS
+        og circuit breaker tjekkes for den URL der faktisk hentes.
+        
         Args:
             session (aiohttp.ClientSession): Aktiv aiohttp session
             url (str): URL at downloade fra
+            errors (List[str], optional): Liste hvor årsagen til en fejl noteres
+            
+        Returns:
+            bytes: PDF indhold hvis success, None hvis fejl. Undtagelser fanges og
+                noteres i errors, så en eventuel alternativ URL stadig forsøges
+        """
+        if errors is None:
+            errors = []
+        
+        # Gå direkte til en cachet endelig URL og fald tilbage til originalen hvis den fejler
+        if self.redirect_cache:
+            cached_url = self.redirect_cache.get(url)
+            if cached_url and self._host_allowed(cached_url, []):
+                try:
+                    content = await self._fetch(session, cached_url, [])
+                except Exception:
+                    content = None
+                if content:
+                    return content
+                # Kun en URL der faktisk er forsøgt og fejlede fjernes fra cachen
+                self.redirect_cache.invalidate(url)
+        
+        if not self._host_allowed(url, errors):
+            return None
+        try:
+            return await self._fetch(session, url, errors, record_redirects=True)
+        except Exception as e:
+            # Timeouts har ingen besked, så typen bruges i stedet
+            errors.append(str(e) or type(e).__name__)
+            logging.error(f"Error downloading {url}: {e}")
+            return None
+    
+    async def _fetch(self, session: aiohttp.ClientSession, url: str, errors: List[str],
+                     record_redirects: bool = False) -> bytes:
+        """
+        Udfører selve requesten mod en URL.
+        
+        Args:
+            session (aiohttp.ClientSession): Aktiv aiohttp session
+            url (str): URL at downloade fra
+            errors (List[str]): Liste hvor årsagen til en fejl noteres
+            record_redirects (bool): Gem redirect kæden i redirect cachen ved succes
             
         Returns:
             bytes: PDF indhold hvis success, None hvis fejl
         """
+        host = get_host(url)
+        proxy = self.proxy_pool.acquire(host) if self.proxy_pool else None
+        started = time.perf_counter()
+        nbytes = 0
+        succeeded = False
+        proxy_failure = False
         try:
-            response = await session.get(url, timeout=self.timeout)
+            if proxy:
+                client = self.proxy_pool.session_for(proxy)
+            else:
+                client = await self._transport_for(session, url)
+            if self._is_insecure(host):
+                response = await client.get(url, timeout=self.timeout, ssl=create_ssl_context(verify=False))
+            else:
+                response = await client.get(url, timeout=self.timeout)
+            if self.host_health:
+                self.host_health.record_success(host)
             async with response as response:
                 if response.status == 200:
                     content_type = response.headers.get('content-type', '').lower()
                     if 'application/pdf' in content_type:
-                        return await response.read()
+                        content = await response.read()
+                        nbytes = len(content)
+                        if self.io_stage and not await self.io_stage.validate(content):
+                            logging.warning(f"URL returned invalid PDF structure: {url}")
+                            errors.append("Invalid PDF structure")
+                            return None
+                        if record_redirects and self.redirect_cache:
+                            self._record_redirect(url, response)
+                        succeeded = True
+                        return content
                     else:
                         logging.warning(f"URL returned non-PDF content: {url} (Content-Type: {content_type})")
+                        errors.append(f"Non-PDF content ({content_type})")
                 else:
                     logging.warning(f"URL returned status {response.status}: {url}")
+                    errors.append(f"HTTP {response.status}")
                 return None
+        except proxy_errors() as e:
+            proxy_url = proxy.url if proxy else ''
+            if is_target_failure(e):
+                # Proxyen svarer, men kan ikke nå hosten
+                if self.host_health:
+                    self.host_health.record_failure(host)
+                logging.warning(f"Proxy {proxy_url} could not reach {host} for {url}: {e}")
+            else:
+                proxy_failure = is_proxy_failure(e)
+                logging.warning(f"Proxy {proxy_url} failed for {url}: {e}")
+            raise
+        except aiohttp.ClientConnectorCertificateError as e:
+            # Hosten svarer, så det tæller ikke mod circuit breakeren
+            logging.warning(f"Certificate verification failed for {url}: {e}. "
+                            f"Use --insecure-hosts {host} to skip verification for this host")
+            raise
+        except CONNECT_ERRORS + http2_connect_errors() as e:
+            if proxy:
+                # Gennem en proxy kan en timeout lige så vel skyldes proxyen, så den
+                # tæller mod proxyen i stedet for at åbne hostens circuit breaker
+                proxy_failure = True
+                logging.warning(f"Download through proxy {proxy.url} failed for {url}: {e!r}")
+            else:
+                if self.host_health:
+                    self.host_health.record_failure(host)
+                logging.warning(f"Download failed for {url}: {e}")
+            raise
         except Exception as e:
             logging.warning(f"Download failed for {url}: {e}")
             raise
+        finally:
+            if proxy:
+                self.proxy_pool.release(proxy, time.perf_counter() - started, nbytes=nbytes,
+                                        error=not succeeded, proxy_failure=proxy_failure)
+    
+    def _record_redirect(self, url: str, response) -> None:
+        """
+        Gemmer redirect kæden for en URL hvis svaret kom via en eller flere redirects.
+        
+        Der sammenlignes ikke med svarets URL, for den er normaliseret (kodede
+        mellemrum og æøå, små bogstaver i hosten) og ville få URL'er uden
+        redirect til at blive cachet som en redirect til sig selv.
+        
+        Args:
+            url (str): Kilde URL
+            response: Svar med url og history (aiohttp eller Http2Response)
+        """
+        history = getattr(response, 'history', ())
+        final_url = getattr(response, 'url', None)
+        if not history or final_url is None:
+            return
+        chain = [str(r.url) for r in history] + [str(final_url)]
+        self.redirect_cache.record(url, str(final_url), chain)
+    
+    async def _transport_for(self, session: aiohttp.ClientSession, url: str):
+        """
+        Vælger transport til en URL.
+        
+        Args:
+            session (aiohttp.ClientSession): Aktiv aiohttp session
+            url (str): URL der skal hentes
+            
+        Returns:
+            HTTP/2 backenden hvis hosten forhandler h2, ellers aiohttp sessionen
+        """
+        if self.http2 and not self._is_insecure(get_host(url)) and await self.http2.supports(url):
+            return self.http2
+        return session
     
-    async def _save_pdf(self, content: bytes, filename: Path) -> None:
+    def _is_insecure(self, host: str) -> bool:
+        """
+        Tjekker om certifikatet for en host ikke skal verificeres.
+        
+        Args:
+            host (str): Hostnavn
+            
+        Returns:
+            bool: True hvis hosten står på insecure_hosts
+        """
+        return bool(self.insecure_hosts) and host_matches(host, self.insecure_hosts)
+    
+    async def _store_pdf(self, url_info: Dict, content: bytes) -> str:
+        """
+        Gemmer en PDF via lageret, enten som løs fil eller i en pakket shard.
+        
+        Args:
+            url_info (Dict): URL information dictionary
+            content (bytes): PDF indhold
+            
+        Returns:
+            str: sha256 af indholdet hvis det er beregnet, ellers None
+        """
+        br_number = url_info['br_number']
+        if self.store.packed:
+            if self.io_stage:
+                digest = await self.io_stage.run(self.store.add_packed, br_number, content)
+            else:
+                digest = await asyncio.to_thread(self.store.add_packed, br_number, content)
+        else:
+            filename = self.store.path_for(br_number, url_info.get('year'))
+            digest = await self._save_pdf(content, filename)
+            self.store.record(br_number, filename)
+        if self.post_processor:
+            await self.post_processor.submit(br_number, content)
+        return digest
+    
+    async def _save_pdf(self, content: bytes, filename: Path) -> str:
         """
         Gemmer PDF indhold til fil.
         
         Args:
             content (bytes): PDF indhold
             filename (Path): Sti hvor filen skal gemmes
+            
+        Returns:
+            str: sha256 af indholdet hvis en io_stage bruges, ellers None
         """
+        if self.io_stage:
+            return await self.io_stage.save(content, filename)
         async with aiofiles.open(filename, 'wb') as f:
             await f.write(content)
\ No newline at end of file
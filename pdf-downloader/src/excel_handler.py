@@ -2,6 +2,8 @@ import pandas as pd
 from typing import List, Dict, Any
 import logging
 from pathlib import Path
+from .report_writers import get_writer, format_for_path
+from .records import UrlRecord
 
 class ExcelHandler:
     """
@@ -10,30 +12,43 @@ class ExcelHandler:
     Attributes:
         excel_file_path (str): Sti til Excel filen
         required_columns (List[str]): Liste af påkrævede kolonner
+        year_column (str): Valgfri kolonne med rapportens år
     """
     
-    def __init__(self, excel_file_path: str):
+    def __init__(self, excel_file_path: str, year_column: str = None):
         """
         Initialiserer ExcelHandler.
         
         Args:
             excel_file_path (str): Sti til Excel filen
+            year_column (str, optional): Kolonne med rapportens år, der tilføjes
+                som 'year' til URL informationen
         """
         self.excel_file_path = excel_file_path
         self.required_columns = ['BRnum', 'Pdf_URL', 'Report Html Address']
+        if year_column:
+            self.required_columns.append(year_column)
+        self.year_column = year_column
         self.df = None
+        self._br_index = None
         self._read_excel()
         
     def _read_excel(self) -> None:
         """
         Læser Excel filen og validerer grundlæggende struktur.
         
+        CSV filer læses med pd.read_csv, så små kørsler ikke skal indlæse openpyxl.
+        
         Raises:
             FileNotFoundError: Hvis Excel filen ikke findes
             ValueError: Hvis filen ikke kan læses som Excel
         """
         try:
-            self.df = pd.read_excel(self.excel_file_path)
+            if str(self.excel_file_path).lower().endswith('.csv'):
+                self.df = pd.read_csv(self.excel_file_path)
+            else:
+                self.df = pd.read_excel(self.excel_file_path)
+            self._br_index = None
             logging.info(f"Successfully read Excel file: {self.excel_file_path}")
             self._validate_columns()
         except FileNotFoundError:
@@ -59,36 +74,60 @@ class ExcelHandler:
         
         return True
 
-    def get_urls(self) -> List[Dict[str, str]]:
+    def _positions_for(self, br_numbers) -> List[int]:
+        """
+        Slår rækkepositioner op for en samling BR numre via et indeks på BRnum.
+        
+        Indekset bygges vektoriseret første gang det bruges og genbruges af
+        senere opslag, så metadata og genkørsel ikke konverterer kolonnen igen.
+        
+        Args:
+            br_numbers (Iterable[str]): BR numre der skal slås op
+            
+        Returns:
+            List[int]: Sorterede rækkepositioner (dubletter af BRnum giver flere positioner)
+        """
+        if self._br_index is None:
+            self._br_index = pd.Index(self.df['BRnum'].astype(str))
+        positions = self._br_index.get_indexer_for(list(set(br_numbers)))
+        return sorted(positions[positions >= 0].tolist())
+
+    def get_urls(self, br_numbers=None) -> List[UrlRecord]:
         """
         Henter URL data fra Excel filen.
         
+        Args:
+            br_numbers (Iterable[str], optional): Begræns til disse BR numre,
+                fx ved genkørsel af fejlede downloads
+        
         Returns:
-            List[Dict]: Liste af dictionaries med URL information:
+            List[UrlRecord]: Liste af URL records med dict-adgang til felterne:
                 {
                     'br_number': str,
                     'primary_url': str,
-                    'alternative_url': str (optional)
+                    'alternative_url': str (optional),
+                    'year': str (kun hvis year_column er angivet)
                 }
         """
         if self.df is None:
             self._read_excel()
 
-        urls = []
-        for _, row in self.df.iterrows():
-            primary_url = row['Pdf_URL']
-            alternative_url = row['Report Html Address']
-            br_number = row['BRnum']
+        rows = self.df if br_numbers is None else self.df.iloc[self._positions_for(br_numbers)]
 
+        years = rows[self.year_column] if self.year_column else [None] * len(rows)
+
+        urls = []
+        for br_number, primary_url, alternative_url, year in zip(
+                rows['BRnum'], rows['Pdf_URL'], rows['Report Html Address'], years):
             if pd.isna(primary_url) and pd.isna(alternative_url):
                 continue
 
-            url_info = {
-                'primary_url': str(primary_url) if not pd.isna(primary_url) else None,
-                'alternative_url': str(alternative_url) if not pd.isna(alternative_url) else None,
-                'br_number': str(br_number)
-            }
-            urls.append(url_info)
+            urls.append(UrlRecord(
+                br_number=str(br_number),
+                primary_url=str(primary_url) if not pd.isna(primary_url) else None,
+                alternative_url=str(alternative_url) if not pd.isna(alternative_url) else None,
+                year=None if year is None or pd.isna(year) else str(year).split('.')[0]
+            ))
 
         if not urls:
             raise ValueError("Ingen gyldige URLs fundet i Excel filen")
@@ -96,12 +135,15 @@ class ExcelHandler:
         logging.info(f"Found {len(urls)} valid URLs to process")
         return urls
 
-    def generate_metadata(self, download_results: List[Dict[str, Any]]) -> pd.DataFrame:
+    def generate_metadata(self, download_results: List[Dict[str, Any]],
+                          pdf_info: Dict[str, Dict] = None) -> pd.DataFrame:
         """
         Genererer metadata i samme format som Metadata2006_2016.xlsx.
         
         Args:
             download_results (List[Dict]): Liste af download resultater
+            pdf_info (Dict[str, Dict], optional): Udtrukket PDF information pr. BR
+                nummer, der tilføjes som ekstra kolonner
             
         Returns:
             pd.DataFrame: DataFrame med metadata i samme format som Metadata2006_2016
@@ -112,18 +154,27 @@ class ExcelHandler:
         # Få liste af BR numre fra download resultaterne
         processed_br_numbers = [result['br_number'] for result in download_results]
         
-        # Filtrer DataFrame til kun at indeholde de processerede rækker
-        metadata_df = self.df[self.df['BRnum'].astype(str).isin(processed_br_numbers)].copy()
+        # Filtrer DataFrame til kun at indeholde de processerede rækker via BRnum indekset
+        metadata_df = self.df.iloc[self._positions_for(processed_br_numbers)].copy()
         
-        # Tilføj download status kolonne
-        metadata_df['Download Status'] = 'Ikke downloadet'  # Default status
+        # Tilføj download status kolonne ud fra om download var succesfuld
+        # (enten primær eller alternativ URL)
+        downloaded = {
+            result['br_number'] for result in download_results
+            if result['status'] in ['success', 'success_alternative']
+        }
+        metadata_df['Download Status'] = [
+            'Downloadet' if br_number in downloaded else 'Ikke downloadet'
+            for br_number in metadata_df['BRnum'].astype(str)
+        ]
         
-        # Opdater status baseret på download resultater
-        for result in download_results:
-            br_number = result['br_number']
-            # Tjek om download var succesfuld (enten primær eller alternativ URL)
-            if result['status'] in ['success', 'success_alternative']:
-                metadata_df.loc[metadata_df['BRnum'].astype(str) == br_number, 'Download Status'] = 'Downloadet'
+        # Tilføj kolonner fra efterbehandlingen af de downloadede PDFs
+        if pdf_info is not None:
+            # Importeres her, så pypdf ikke indlæses når der ikke er efterbehandling
+            from .pdf_processing import INFO_COLUMNS
+            br_numbers = metadata_df['BRnum'].astype(str)
+            for column, key in INFO_COLUMNS:
+                metadata_df[column] = [pdf_info.get(br_number, {}).get(key) for br_number in br_numbers]
         
         # Log antal downloadede filer
         successful = (metadata_df['Download Status'] == 'Downloadet').sum()
@@ -134,14 +185,19 @@ class ExcelHandler:
 
     def save_metadata(self, metadata_df: pd.DataFrame, output_path: str) -> None:
         """
-        Gemmer metadata til en ny Excel fil.
+        Gemmer metadata til en ny fil.
+        
+        Formatet (xlsx, csv eller parquet) udledes af filens endelse, og
+        rækkerne skrives i row groups med en streamende writer.
         
         Args:
             metadata_df (pd.DataFrame): DataFrame med metadata
             output_path (str): Sti hvor metadata skal gemmes
         """
         try:
-            metadata_df.to_excel(output_path, index=False)
+            columns = [str(column) for column in metadata_df.columns]
+            with get_writer(format_for_path(output_path), output_path, columns) as writer:
+                writer.write_frame(metadata_df)
             logging.info(f"Saved metadata to: {output_path}")
         except Exception as e:
             logging.error(f"Error saving metadata: {e}")
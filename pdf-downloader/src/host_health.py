@@ -0,0 +1,190 @@
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .utils import get_host
+
+# Tilstande for en host's circuit breaker
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class HostHealthTracker:
+    """
+    Holder styr på hver hosts helbred og implementerer en circuit breaker pr. host.
+
+    Efter `failure_threshold` fortløbende connect-fejl eller timeouts åbnes
+    breakeren, og efterfølgende URLs for hosten afvises med det samme. Når
+    `cooldown` sekunder er gået, tillades én probe (half-open). Lykkes proben
+    lukkes breakeren igen, ellers åbnes den på ny.
+
+    Attributes:
+        state_file (Path): Sti hvor host tilstanden gemmes mellem kørsler
+        failure_threshold (int): Antal fortløbende fejl før breakeren åbnes
+        cooldown (float): Sekunder før en åben breaker tillader en probe
+        hosts (Dict[str, Dict]): Tilstand pr. host
+    """
+
+    def __init__(self, state_file: Optional[str] = None, failure_threshold: int = 5,
+                 cooldown: float = 300):
+        """
+        Initialiserer HostHealthTracker og indlæser tidligere tilstand hvis den findes.
+
+        Args:
+            state_file (str, optional): JSON fil med host tilstand fra tidligere kørsler
+            failure_threshold (int): Antal fortløbende fejl før breakeren åbnes
+            cooldown (float): Sekunder før en åben breaker tillader en probe
+        """
+        self.state_file = Path(state_file) if state_file else None
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.hosts: Dict[str, Dict] = {}
+        self._probing: Dict[str, float] = {}
+        if self.state_file and self.state_file.exists():
+            self.load()
+
+    def _entry(self, host: str) -> Dict:
+        """
+        Returnerer (og opretter om nødvendigt) tilstanden for en host.
+        """
+        entry = self.hosts.get(host)
+        if entry is None:
+            entry = {
+                'state': CLOSED,
+                'consecutive_failures': 0,
+                'total_failures': 0,
+                'total_successes': 0,
+                'opened_at': None
+            }
+            self.hosts[host] = entry
+        return entry
+
+    def state(self, host: str) -> str:
+        """
+        Returnerer den aktuelle breaker tilstand for en host.
+
+        Args:
+            host (str): Hostnavn
+
+        Returns:
+            str: 'closed', 'open' eller 'half_open'
+        """
+        entry = self.hosts.get(host)
+        if entry is None:
+            return CLOSED
+        if entry['state'] == OPEN and time.time() - entry['opened_at'] >= self.cooldown:
+            return HALF_OPEN
+        return entry['state']
+
+    def allow_request(self, host: Optional[str]) -> bool:
+        """
+        Afgør om der må sendes en request til hosten.
+
+        En åben breaker afviser alle requests indtil cooldown er udløbet. Derefter
+        får præcis én request lov at probe hosten, mens resten fortsat afvises.
+
+        Args:
+            host (str): Hostnavn
+
+        Returns:
+            bool: True hvis requesten må sendes
+        """
+        if host is None:
+            return True
+        state = self.state(host)
+        if state == CLOSED:
+            return True
+        # En probe der aldrig blev afsluttet betragtes som forældet efter cooldown
+        probe_started = self._probing.get(host)
+        probe_stale = probe_started is None or time.time() - probe_started >= self.cooldown
+        if state == HALF_OPEN and probe_stale:
+            self._probing[host] = time.time()
+            logging.info(f"Circuit half-open for {host}, sending probe")
+            return True
+        return False
+
+    def record_success(self, host: Optional[str]) -> None:
+        """
+        Registrerer at hosten svarede, og lukker breakeren.
+
+        Args:
+            host (str): Hostnavn
+        """
+        if host is None:
+            return
+        entry = self._entry(host)
+        if entry['state'] != CLOSED:
+            logging.info(f"Circuit closed for {host}")
+        entry['state'] = CLOSED
+        entry['consecutive_failures'] = 0
+        entry['total_successes'] += 1
+        entry['opened_at'] = None
+        self._probing.pop(host, None)
+
+    def record_failure(self, host: Optional[str]) -> None:
+        """
+        Registrerer en connect-fejl eller timeout og åbner breakeren ved behov.
+
+        Args:
+            host (str): Hostnavn
+        """
+        if host is None:
+            return
+        entry = self._entry(host)
+        entry['consecutive_failures'] += 1
+        entry['total_failures'] += 1
+        probe_failed = self._probing.pop(host, None) is not None
+        if probe_failed or entry['consecutive_failures'] >= self.failure_threshold:
+            if entry['state'] != OPEN or probe_failed:
+                logging.warning(
+                    f"Circuit opened for {host} after {entry['consecutive_failures']} consecutive failures"
+                )
+            entry['state'] = OPEN
+            entry['opened_at'] = time.time()
+
+    def prioritize(self, urls: List[Dict]) -> List[Dict]:
+        """
+        Sorterer URLs så hosts med åben breaker kommer sidst.
+
+        Sorteringen er stabil, så rækkefølgen fra Excel filen bevares inden for
+        hver gruppe.
+
+        Args:
+            urls (List[Dict]): Liste af URL information dictionaries
+
+        Returns:
+            List[Dict]: Sorteret liste af URL information dictionaries
+        """
+        def is_dead(url_info):
+            host = get_host(url_info.get('primary_url'))
+            return host in self.hosts and self.hosts[host]['state'] == OPEN
+
+        return sorted(urls, key=is_dead)
+
+    def load(self) -> None:
+        """
+        Indlæser host tilstand fra state filen.
+        """
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                self.hosts = json.load(f)
+            logging.info(f"Loaded health state for {len(self.hosts)} hosts from {self.state_file}")
+        except (OSError, ValueError) as e:
+            logging.warning(f"Could not load host health state: {e}")
+            self.hosts = {}
+
+    def save(self) -> None:
+        """
+        Gemmer host tilstand til state filen.
+        """
+        if not self.state_file:
+            return
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.state_file.with_suffix('.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.hosts, f)
+        tmp_file.replace(self.state_file)
+        logging.info(f"Saved health state for {len(self.hosts)} hosts to {self.state_file}")
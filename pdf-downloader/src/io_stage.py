@@ -0,0 +1,256 @@
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List
+
+# Antal bytes i starten og slutningen af en PDF som strukturtjekket kigger på
+PDF_HEAD_SIZE = 1024
+PDF_TAIL_SIZE = 2048
+
+
+def write_and_hash(content: bytes, filename: str, buffer_size: int) -> str:
+    """
+    Skriver indhold til fil i store blokke og beregner sha256 i samme gennemløb.
+
+    Filen skrives først til en midlertidig sti og omdøbes bagefter, så en
+    afbrudt skrivning aldrig efterlader en halv PDF.
+
+    Args:
+        content (bytes): Indhold der skal skrives
+        filename (str): Endelig sti for filen
+        buffer_size (int): Størrelse af hver skriveblok i bytes
+
+    Returns:
+        str: sha256 hex digest af indholdet
+    """
+    digest = hashlib.sha256()
+    view = memoryview(content)
+    tmp_name = f"{filename}.part"
+    with open(tmp_name, 'wb', buffering=buffer_size) as f:
+        for offset in range(0, len(view), buffer_size):
+            block = view[offset:offset + buffer_size]
+            digest.update(block)
+            f.write(block)
+    os.replace(tmp_name, filename)
+    return digest.hexdigest()
+
+
+def pdf_excerpt(content: bytes) -> bytes:
+    """
+    Returnerer de dele af en PDF som validate_pdf_structure kigger på.
+
+    Start og slutning sættes sammen, så tjekket giver samme resultat som på
+    hele indholdet, men kun få KB skal sendes til en anden proces.
+
+    Args:
+        content (bytes): PDF indhold
+
+    Returns:
+        bytes: Højst PDF_HEAD_SIZE + PDF_TAIL_SIZE bytes
+    """
+    if len(content) <= PDF_HEAD_SIZE + PDF_TAIL_SIZE:
+        return content
+    return content[:PDF_HEAD_SIZE] + content[-PDF_TAIL_SIZE:]
+
+
+def validate_pdf_structure(content: bytes) -> bool:
+    """
+    Udfører et let strukturtjek af en PDF.
+
+    Tjekker at headeren findes i starten af filen og at der er en EOF markør
+    og en xref/startxref sektion i slutningen.
+
+    Args:
+        content (bytes): PDF indhold
+
+    Returns:
+        bool: True hvis strukturen ser gyldig ud
+    """
+    if b'%PDF-' not in content[:PDF_HEAD_SIZE]:
+        return False
+    tail = content[-PDF_TAIL_SIZE:]
+    return b'%%EOF' in tail and b'startxref' in tail
+
+
+class IOStage:
+    """
+    Afgrænset executor stage til fil-I/O og CPU-tungt arbejde.
+
+    Skrivning og hashing kører i en dedikeret trådpulje, og PDF validering kan
+    køre i en procespulje. En semafor begrænser antallet af ventende jobs, så
+    event loopet ikke kan stable ubegrænset arbejde op.
+
+    Attributes:
+        buffer_size (int): Størrelse af skriveblokke i bytes
+        max_pending (int): Maksimalt antal jobs i kø eller under udførsel
+        validate_pdfs (bool): Om PDF strukturen valideres før filen accepteres
+    """
+
+    def __init__(self, max_workers: int = 4, max_pending: int = 64,
+                 buffer_size: int = 1024 * 1024, validate_pdfs: bool = False,
+                 validate_processes: int = 0):
+        """
+        Initialiserer IOStage.
+
+        Args:
+            max_workers (int): Antal tråde til skrivning og hashing
+            max_pending (int): Maksimalt antal samtidige jobs
+            buffer_size (int): Størrelse af skriveblokke i bytes
+            validate_pdfs (bool): Om PDF strukturen valideres før filen accepteres
+            validate_processes (int): Antal processer til PDF validering (0 = brug tråde)
+        """
+        self.buffer_size = buffer_size
+        self.max_pending = max_pending
+        self.validate_pdfs = validate_pdfs
+        self._threads = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='pdf-io')
+        self._processes = ProcessPoolExecutor(max_workers=validate_processes) if validate_processes else None
+        self._semaphore = None
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """
+        Opretter semaforen i det kørende event loop.
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_pending)
+        return self._semaphore
+
+    async def save(self, content: bytes, filename: Path) -> str:
+        """
+        Gemmer indhold og beregner sha256 uden for event loopet.
+
+        Args:
+            content (bytes): PDF indhold
+            filename (Path): Sti hvor filen skal gemmes
+
+        Returns:
+            str: sha256 hex digest af indholdet
+        """
+        loop = asyncio.get_running_loop()
+        async with self._get_semaphore():
+            return await loop.run_in_executor(
+                self._threads, write_and_hash, content, str(filename), self.buffer_size
+            )
+
+    async def run(self, func, *args):
+        """
+        Kører en vilkårlig blokerende funktion i trådpuljen.
+
+        Args:
+            func (Callable): Funktion der skal køres
+            *args: Argumenter til funktionen
+
+        Returns:
+            Funktionens returværdi
+        """
+        loop = asyncio.get_running_loop()
+        async with self._get_semaphore():
+            return await loop.run_in_executor(self._threads, func, *args)
+
+    async def validate(self, content: bytes) -> bool:
+        """
+        Validerer PDF strukturen i procespuljen, eller i trådpuljen hvis den ikke bruges.
+
+        Kun start og slutning af filen sendes med, så procespuljen ikke skal
+        pickle hele PDF'en.
+
+        Args:
+            content (bytes): PDF indhold
+
+        Returns:
+            bool: True hvis strukturen ser gyldig ud, eller hvis validering er slået fra
+        """
+        if not self.validate_pdfs:
+            return True
+        loop = asyncio.get_running_loop()
+        executor = self._processes or self._threads
+        async with self._get_semaphore():
+            return await loop.run_in_executor(executor, validate_pdf_structure, pdf_excerpt(content))
+
+    def close(self) -> None:
+        """
+        Lukker executor puljerne og venter på igangværende jobs.
+        """
+        self._threads.shutdown(wait=True)
+        if self._processes:
+            self._processes.shutdown(wait=True)
+
+
+class LoopLagMonitor:
+    """
+    Måler hvor forsinket event loopet er ved periodisk at sove og måle oversovet tid.
+
+    Attributes:
+        interval (float): Sekunder mellem målinger
+        samples (List[float]): Målte forsinkelser i sekunder
+    """
+
+    def __init__(self, interval: float = 0.1):
+        """
+        Initialiserer LoopLagMonitor.
+
+        Args:
+            interval (float): Sekunder mellem målinger
+        """
+        self.interval = interval
+        self.samples: List[float] = []
+        self._task = None
+
+    async def _run(self) -> None:
+        """
+        Måler løbende forskellen mellem ønsket og faktisk sovetid.
+        """
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, time.perf_counter() - started - self.interval))
+
+    def start(self) -> None:
+        """
+        Starter målingen i det kørende event loop.
+        """
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Stopper målingen.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def snapshot(self) -> Dict[str, float]:
+        """
+        Returnerer statistik over den målte event loop forsinkelse.
+
+        Returns:
+            Dict: Antal målinger samt gennemsnitlig, p99 og maksimal forsinkelse i millisekunder
+        """
+        if not self.samples:
+            return {'samples': 0, 'mean_ms': 0.0, 'p99_ms': 0.0, 'max_ms': 0.0}
+        ordered = sorted(self.samples)
+        p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+        return {
+            'samples': len(ordered),
+            'mean_ms': sum(ordered) / len(ordered) * 1000,
+            'p99_ms': p99 * 1000,
+            'max_ms': ordered[-1] * 1000
+        }
+
+    def log(self) -> None:
+        """
+        Logger den målte event loop forsinkelse.
+        """
+        stats = self.snapshot()
+        logging.info(
+            f"Event loop lag: mean {stats['mean_ms']:.1f} ms, p99 {stats['p99_ms']:.1f} ms, "
+            f"max {stats['max_ms']:.1f} ms over {stats['samples']} samples"
+        )
@@ -0,0 +1,194 @@
+import asyncio
+import bisect
+import io
+import logging
+import re
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional
+
+try:
+    import pypdf
+except ImportError:  # pypdf er valgfri; uden den bruges en simpel parser
+    pypdf = None
+
+# Kolonner der tilføjes til metadata og de felter de hentes fra
+INFO_COLUMNS = [
+    ('Page Count', 'page_count'),
+    ('PDF Version', 'pdf_version'),
+    ('Encrypted', 'encrypted'),
+    ('First Page Text', 'first_page_text')
+]
+
+# Maksimalt antal tegn af første sides tekst der gemmes
+MAX_TEXT_LENGTH = 1000
+
+_VERSION_RE = re.compile(rb'%PDF-(\d\.\d)')
+_PAGE_RE = re.compile(rb'/Type\s*/Page(?![a-zA-Z])')
+_OBJ_RE = re.compile(rb'(\d+)\s+\d+\s+obj\b')
+_STREAM_RE = re.compile(rb'stream\r?\n(.*?)\r?\nendstream', re.S)
+_TEXT_RE = re.compile(rb'\(((?:\\.|[^\\)])*)\)\s*Tj|\[(.*?)\]\s*TJ', re.S)
+_STRING_RE = re.compile(rb'\(((?:\\.|[^\\)])*)\)')
+
+
+def _first_page_text_fallback(content: bytes) -> str:
+    """
+    Finder tekst i den første content stream der indeholder tekstoperatorer.
+
+    Dækker kun simple PDFs (ukomprimerede eller FlateDecode streams med
+    literal strings), men kræver ingen eksterne afhængigheder.
+    """
+    for match in _STREAM_RE.finditer(content):
+        data = match.group(1)
+        try:
+            data = zlib.decompress(data)
+        except zlib.error:
+            pass
+        parts = []
+        for text_match in _TEXT_RE.finditer(data):
+            if text_match.group(1) is not None:
+                parts.append(text_match.group(1))
+            else:
+                parts.extend(_STRING_RE.findall(text_match.group(2)))
+        if parts:
+            text = b' '.join(parts).replace(b'\\(', b'(').replace(b'\\)', b')')
+            return text.decode('latin-1')[:MAX_TEXT_LENGTH]
+    return ''
+
+
+def _page_count_fallback(content: bytes) -> Optional[int]:
+    """
+    Tæller sideobjekter uden pypdf.
+
+    Sider i komprimerede object streams (PDF 1.5+) kan ikke ses, så der
+    returneres None i stedet for et forkert tal. Et sideobjekt der skrives
+    igen af en inkrementel opdatering tælles kun én gang.
+    """
+    if b'/ObjStm' in content:
+        return None
+    headers = [(match.start(), match.group(1)) for match in _OBJ_RE.finditer(content)]
+    starts = [start for start, _ in headers]
+    pages = set()
+    for match in _PAGE_RE.finditer(content):
+        position = bisect.bisect_right(starts, match.start()) - 1
+        pages.add(headers[position][1] if position >= 0 else match.start())
+    return len(pages) or None
+
+
+def extract_pdf_info(content: bytes) -> Dict:
+    """
+    Udtrækker sideantal, PDF version, krypteringsflag og tekst fra første side.
+
+    Bruger pypdf hvis det er installeret, ellers en simpel byte-baseret parser.
+    Funktionen kører i en separat proces og må derfor ikke afhænge af tilstand.
+
+    Args:
+        content (bytes): PDF indhold
+
+    Returns:
+        Dict: {'page_count': int, 'pdf_version': str, 'encrypted': bool,
+            'first_page_text': str}. page_count er None hvis siderne ikke kan tælles
+    """
+    version = _VERSION_RE.search(content[:1024])
+    info = {
+        'page_count': None,
+        'pdf_version': version.group(1).decode() if version else None,
+        'encrypted': b'/Encrypt' in content,
+        'first_page_text': ''
+    }
+    if pypdf is not None:
+        try:
+            reader = pypdf.PdfReader(io.BytesIO(content))
+            info['encrypted'] = reader.is_encrypted
+            if not reader.is_encrypted:
+                info['page_count'] = len(reader.pages)
+                if reader.pages:
+                    info['first_page_text'] = (reader.pages[0].extract_text() or '')[:MAX_TEXT_LENGTH]
+            return info
+        except Exception:
+            pass
+    info['page_count'] = _page_count_fallback(content)
+    if not info['encrypted']:
+        info['first_page_text'] = _first_page_text_fallback(content)
+    return info
+
+
+def _safe_extract(content: bytes) -> Dict:
+    """
+    Kører extract_pdf_info og returnerer en fejl i stedet for at kaste den.
+    """
+    try:
+        return extract_pdf_info(content)
+    except Exception as e:
+        return {'error': str(e)}
+
+
+class PDFProcessingStage:
+    """
+    Pipeline stage der udtrækker PDF information i en procespulje lige efter download.
+
+    PDF'en behandles fra de bytes der allerede ligger i hukommelsen, så filen
+    ikke skal læses igen. En semafor begrænser antallet af ventende jobs, så
+    downloads venter (backpressure) når procespuljen ikke kan følge med.
+
+    Attributes:
+        max_pending (int): Maksimalt antal jobs i kø eller under udførsel
+        results (Dict[str, Dict]): Udtrukket information pr. BR nummer
+    """
+
+    def __init__(self, processes: int = 2, max_pending: int = 32):
+        """
+        Initialiserer PDFProcessingStage.
+
+        Args:
+            processes (int): Antal processer i puljen
+            max_pending (int): Maksimalt antal jobs i kø eller under udførsel
+        """
+        self.max_pending = max_pending
+        self.results: Dict[str, Dict] = {}
+        self._executor = ProcessPoolExecutor(max_workers=processes)
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._pending = set()
+
+    async def submit(self, br_number: str, content: bytes) -> None:
+        """
+        Sender en PDF til udtrækning. Venter kun hvis for mange jobs er i gang.
+
+        Args:
+            br_number (str): BR nummer
+            content (bytes): PDF indhold
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_pending)
+        await self._semaphore.acquire()
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._executor, _safe_extract, content)
+        self._pending.add(future)
+
+        def done(fut):
+            self._pending.discard(fut)
+            self._semaphore.release()
+            if fut.cancelled():
+                return
+            if fut.exception() is not None:
+                info = {'error': str(fut.exception())}
+            else:
+                info = fut.result()
+            if 'error' in info:
+                logging.warning(f"PDF processing failed for {br_number}: {info['error']}")
+            self.results[br_number] = info
+
+        future.add_done_callback(done)
+
+    async def drain(self) -> None:
+        """
+        Venter på at alle indsendte jobs er færdige.
+        """
+        if self._pending:
+            await asyncio.gather(*list(self._pending), return_exceptions=True)
+
+    def close(self) -> None:
+        """
+        Lukker procespuljen.
+        """
+        self._executor.shutdown(wait=True)
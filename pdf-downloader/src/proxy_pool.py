@@ -0,0 +1,332 @@
+import logging
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import aiohttp
+
+# aiohttp_socks er valgfri og kun nødvendig for SOCKS proxies. Den importeres
+# først når en pulje med SOCKS proxies oprettes
+ProxyConnector = None
+SocksProxyError = None
+
+# Fejl der opstår i forbindelsen gennem proxyen. Se is_proxy_failure for
+# hvilke af dem der skyldes proxyen selv, og proxy_errors for SOCKS fejl
+PROXY_ERRORS = (aiohttp.ClientProxyConnectionError, aiohttp.ClientHttpProxyError)
+
+# CONNECT svar der betyder at proxyen ikke kunne nå target hosten
+TARGET_FAILURE_STATUSES = (502, 503, 504)
+
+# CONNECT svar der betyder at proxyen afviser os (login eller adgang)
+PROXY_FAILURE_STATUSES = (401, 403, 407)
+
+POLICIES = ('least_loaded', 'sticky')
+
+
+def _load_socks() -> bool:
+    """
+    Importerer aiohttp_socks første gang en SOCKS proxy skal bruges.
+
+    Returns:
+        bool: True hvis aiohttp_socks er installeret
+    """
+    global ProxyConnector, SocksProxyError
+    if ProxyConnector is None:
+        try:
+            from aiohttp_socks import ProxyConnector
+            from python_socks import ProxyError as SocksProxyError
+        except ImportError:
+            return False
+    return True
+
+
+def proxy_errors() -> tuple:
+    """
+    Returnerer PROXY_ERRORS plus SOCKS fejl hvis aiohttp_socks er importeret.
+    """
+    if SocksProxyError is not None:
+        return PROXY_ERRORS + (SocksProxyError,)
+    return PROXY_ERRORS
+
+
+def is_proxy_failure(error: Exception) -> bool:
+    """
+    Afgør om en proxy fejl skyldes proxyen selv.
+
+    Forbindelsesfejl til proxyen og afviste logins tæller mod proxyen. Svarer
+    proxyen 502/503/504 på CONNECT, er det target hosten der er død, og andre
+    statusser tæller hverken mod proxyen eller hosten.
+
+    Args:
+        error (Exception): Fejl fanget via proxy_errors()
+
+    Returns:
+        bool: True hvis fejlen skal tælle mod proxyens helbred
+    """
+    if isinstance(error, aiohttp.ClientHttpProxyError):
+        return error.status in PROXY_FAILURE_STATUSES
+    return True
+
+
+def is_target_failure(error: Exception) -> bool:
+    """
+    Afgør om en proxy fejl betyder at target hosten ikke kunne nås.
+
+    Args:
+        error (Exception): Fejl fanget via proxy_errors()
+
+    Returns:
+        bool: True hvis fejlen skal tælle mod hostens circuit breaker
+    """
+    return isinstance(error, aiohttp.ClientHttpProxyError) and error.status in TARGET_FAILURE_STATUSES
+
+
+def load_proxy_list(path: str) -> List[str]:
+    """
+    Indlæser proxies fra en tekstfil med én proxy URL pr. linje.
+
+    Tomme linjer og linjer der starter med '#' springes over.
+
+    Args:
+        path (str): Sti til filen
+
+    Returns:
+        List[str]: Proxy URLs
+
+    Raises:
+        FileNotFoundError: Hvis filen ikke findes
+    """
+    proxy_file = Path(path)
+    if not proxy_file.exists():
+        raise FileNotFoundError(f"Proxy fil ikke fundet: {path}")
+    with open(proxy_file, 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip() and not line.strip().startswith('#')]
+
+
+class Proxy:
+    """
+    En proxy i puljen med dens belastning, helbred og statistik.
+
+    Attributes:
+        url (str): Proxy URL, fx http://10.0.0.1:3128 eller socks5://10.0.0.2:1080
+        active (int): Requests der er i gang gennem proxyen
+        requests (int): Afsluttede requests
+        errors (int): Requests der fejlede, uanset årsag
+        proxy_failures (int): Fejl hos proxyen selv
+        consecutive_failures (int): Fortløbende proxy fejl
+        bytes (int): Downloadede bytes
+        busy_time (float): Samlet tid brugt på requests i sekunder
+        down_until (float): Tidspunkt (time.monotonic) hvor proxyen må bruges igen
+    """
+
+    def __init__(self, url: str):
+        """
+        Initialiserer Proxy.
+
+        Args:
+            url (str): Proxy URL
+        """
+        self.url = url
+        self.active = 0
+        self.requests = 0
+        self.errors = 0
+        self.proxy_failures = 0
+        self.consecutive_failures = 0
+        self.bytes = 0
+        self.busy_time = 0.0
+        self.down_until = 0.0
+
+    @property
+    def is_socks(self) -> bool:
+        return self.url.lower().startswith(('socks4://', 'socks5://', 'socks5h://'))
+
+    def available(self, now: float) -> bool:
+        """
+        Returnerer True hvis proxyen ikke er taget ud af puljen.
+        """
+        return now >= self.down_until
+
+    def stats(self) -> Dict:
+        """
+        Returnerer statistik for proxyen.
+
+        Returns:
+            Dict: Requests, fejl, bytes, gennemsnitlig varighed og gennemløb
+        """
+        return {
+            'proxy': self.url,
+            'requests': self.requests,
+            'errors': self.errors,
+            'proxy_failures': self.proxy_failures,
+            'bytes': self.bytes,
+            'mean_request_ms': round(self.busy_time / self.requests * 1000, 1) if self.requests else 0.0,
+            'throughput_kbps': round(self.bytes / 1024 / self.busy_time, 1) if self.busy_time else 0.0
+        }
+
+
+class ProxyPool:
+    """
+    Pulje af HTTP og SOCKS proxies med en separat connector pr. proxy.
+
+    Requests fordeles efter `policy`:
+    - 'least_loaded': proxyen med færrest aktive requests
+    - 'sticky': samme proxy pr. host, så længe proxyen er rask
+
+    En proxy der fejler `max_failures` gange i træk tages ud af puljen i
+    `cooldown` sekunder. Er alle proxies ude, bruges den der først kommer
+    tilbage, så downloads ikke går i stå.
+
+    Attributes:
+        proxies (List[Proxy]): Proxies i puljen
+        policy (str): 'least_loaded' eller 'sticky'
+        cooldown (float): Sekunder en fejlende proxy er ude af puljen
+        max_failures (int): Fortløbende fejl før en proxy tages ud
+    """
+
+    def __init__(self, proxies: List[str], policy: str = 'least_loaded',
+                 cooldown: float = 60, max_failures: int = 3):
+        """
+        Initialiserer ProxyPool.
+
+        Args:
+            proxies (List[str]): Proxy URLs (http://, https://, socks4://, socks5://)
+            policy (str): 'least_loaded' eller 'sticky'
+            cooldown (float): Sekunder en fejlende proxy er ude af puljen
+            max_failures (int): Fortløbende fejl før en proxy tages ud
+
+        Raises:
+            ValueError: Hvis listen er tom eller policy er ukendt
+            ImportError: Hvis der er SOCKS proxies og aiohttp_socks ikke er installeret
+        """
+        if not proxies:
+            raise ValueError("ProxyPool kræver mindst én proxy")
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown proxy policy: {policy}")
+        self.proxies = [Proxy(url) for url in dict.fromkeys(proxies)]
+        if any(proxy.is_socks for proxy in self.proxies) and not _load_socks():
+            raise ImportError("SOCKS proxies kræver aiohttp_socks: pip install aiohttp-socks")
+        self.policy = policy
+        self.cooldown = cooldown
+        self.max_failures = max_failures
+        self._sticky: Dict[str, Proxy] = {}
+        self._sessions: Dict[str, aiohttp.ClientSession] = {}
+        self._ssl = None
+        self._trace_configs = None
+
+    def open(self, ssl_context=None, trace_configs=None) -> None:
+        """
+        Sætter de indstillinger som proxyernes sessioner oprettes med.
+
+        Args:
+            ssl_context (ssl.SSLContext, optional): Context til forbindelser gennem proxyerne
+            trace_configs (List[aiohttp.TraceConfig], optional): Trace hooks til sessionerne
+        """
+        self._ssl = ssl_context
+        self._trace_configs = trace_configs
+
+    def acquire(self, host: Optional[str] = None) -> Proxy:
+        """
+        Vælger en proxy til en request og markerer den som aktiv.
+
+        Args:
+            host (str, optional): Target host, bruges af 'sticky' policy
+
+        Returns:
+            Proxy: Den valgte proxy
+        """
+        now = time.monotonic()
+        available = [proxy for proxy in self.proxies if proxy.available(now)]
+        if not available:
+            proxy = min(self.proxies, key=lambda p: p.down_until)
+        elif self.policy == 'sticky' and host:
+            proxy = self._sticky.get(host)
+            if proxy is None or not proxy.available(now):
+                proxy = min(available, key=lambda p: (p.active, p.requests))
+                self._sticky[host] = proxy
+        else:
+            proxy = min(available, key=lambda p: (p.active, p.requests))
+        proxy.active += 1
+        return proxy
+
+    def release(self, proxy: Proxy, elapsed: float, nbytes: int = 0,
+                error: bool = False, proxy_failure: bool = False) -> None:
+        """
+        Registrerer resultatet af en request gennem en proxy.
+
+        Args:
+            proxy (Proxy): Proxyen fra acquire
+            elapsed (float): Requestens varighed i sekunder
+            nbytes (int): Downloadede bytes
+            error (bool): Requesten fejlede
+            proxy_failure (bool): Fejlen skyldtes proxyen selv
+        """
+        proxy.active -= 1
+        proxy.requests += 1
+        proxy.bytes += nbytes
+        proxy.busy_time += elapsed
+        if error:
+            proxy.errors += 1
+        if not proxy_failure:
+            proxy.consecutive_failures = 0
+            return
+        proxy.proxy_failures += 1
+        proxy.consecutive_failures += 1
+        if proxy.consecutive_failures >= self.max_failures:
+            proxy.down_until = time.monotonic() + self.cooldown
+            proxy.consecutive_failures = 0
+            logging.warning(f"Proxy {proxy.url} removed from pool for {self.cooldown:.0f}s after "
+                            f"{self.max_failures} consecutive failures")
+
+    def session_for(self, proxy: Proxy) -> aiohttp.ClientSession:
+        """
+        Returnerer sessionen for en proxy og opretter den første gang.
+
+        HTTP proxies får deres egen TCPConnector med proxyen som session default,
+        SOCKS proxies en ProxyConnector fra aiohttp_socks.
+
+        Args:
+            proxy (Proxy): Proxy fra puljen
+
+        Returns:
+            aiohttp.ClientSession: Session der sender alle requests gennem proxyen
+        """
+        session = self._sessions.get(proxy.url)
+        if session is None:
+            ssl_context = self._ssl if self._ssl is not None else True
+            if proxy.is_socks:
+                connector = ProxyConnector.from_url(proxy.url, ssl=ssl_context)
+                session = aiohttp.ClientSession(connector=connector, trace_configs=self._trace_configs)
+            else:
+                connector = aiohttp.TCPConnector(ssl=ssl_context)
+                session = aiohttp.ClientSession(connector=connector, proxy=proxy.url,
+                                                trace_configs=self._trace_configs)
+            self._sessions[proxy.url] = session
+        return session
+
+    def stats(self) -> List[Dict]:
+        """
+        Returnerer statistik pr. proxy.
+
+        Returns:
+            List[Dict]: Én række pr. proxy, se Proxy.stats
+        """
+        return [proxy.stats() for proxy in self.proxies]
+
+    def log(self) -> None:
+        """
+        Logger statistik pr. proxy.
+        """
+        for row in self.stats():
+            logging.info(
+                f"Proxy {row['proxy']}: {row['requests']} requests, {row['errors']} errors "
+                f"({row['proxy_failures']} proxy failures), {row['bytes'] / 1024 / 1024:.1f} MB, "
+                f"{row['throughput_kbps']:.0f} KB/s"
+            )
+
+    async def close(self) -> None:
+        """
+        Lukker alle proxy sessioner.
+        """
+        for session in self._sessions.values():
+            await session.close()
+        self._sessions.clear()
@@ -0,0 +1,138 @@
+import sys
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Dict, Optional
+
+from .utils import classify_error
+
+
+class DownloadStatus(Enum):
+    """
+    Status for et download. Værdierne er de strenge rapporterne bruger.
+    """
+    SUCCESS = 'success'
+    SUCCESS_ALTERNATIVE = 'success_alternative'
+    FAILED = 'failed'
+
+
+class _MappingMixin:
+    """
+    Giver slots-records den dict-adgang som rapport- og metadatakoden bruger
+    (record['key'], record.get('key'), 'key' in record).
+    """
+
+    __slots__ = ()
+    _keys = ()
+    # Nøgler der kun findes når de har en værdi, ligesom i de gamle dicts
+    _optional = ()
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._keys:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key not in self._keys:
+            return default
+        value = getattr(self, key)
+        return default if value is None else value
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._keys and (key not in self._optional or getattr(self, key) is not None)
+
+    def keys(self):
+        return [key for key in self._keys if key in self]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Returnerer recorden som en almindelig dictionary.
+        """
+        return {key: self[key] for key in self.keys()}
+
+
+@dataclass(slots=True)
+class UrlRecord(_MappingMixin):
+    """
+    URL information for én række i Excel filen.
+
+    Attributes:
+        br_number (str): BR nummer
+        primary_url (str): Pdf_URL eller None
+        alternative_url (str): Report Html Address eller None
+        year (str): Rapportens år, hvis en år-kolonne er angivet
+    """
+    br_number: str
+    primary_url: Optional[str]
+    alternative_url: Optional[str]
+    year: Optional[str] = None
+
+    _keys = ('br_number', 'primary_url', 'alternative_url', 'year')
+    _optional = ('year',)
+
+
+@dataclass(slots=True)
+class DownloadResult(_MappingMixin):
+    """
+    Resultat af et download.
+
+    URL felterne deles med UrlRecord'en i stedet for at blive kopieret, status
+    er en enum, fejlbeskeder interneres, og tidspunktet er et Unix timestamp.
+    Via dict-adgang returneres status og tidspunkt som de strenge rapporterne
+    forventer.
+
+    Attributes:
+        url (UrlRecord): URL information for rækken
+        status (DownloadStatus): Download status
+        error_message (str): Fejlbesked, tom ved succes
+        created_at (float): Unix timestamp for resultatet
+        sha256 (str): sha256 af den gemte PDF, hvis den er beregnet
+    """
+    url: Any
+    status: DownloadStatus = DownloadStatus.FAILED
+    error_message: str = ''
+    created_at: float = 0.0
+    sha256: Optional[str] = None
+
+    _keys = ('br_number', 'primary_url', 'alternative_url', 'status', 'error_message', 'timestamp', 'sha256')
+    _optional = ('sha256',)
+
+    @property
+    def br_number(self) -> str:
+        return self.url['br_number']
+
+    @property
+    def primary_url(self) -> Optional[str]:
+        return self.url['primary_url']
+
+    @property
+    def alternative_url(self) -> Optional[str]:
+        return self.url['alternative_url']
+
+    @property
+    def timestamp(self) -> str:
+        return time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self.created_at))
+
+    @property
+    def error_class(self) -> str:
+        return classify_error(self.error_message)
+
+    def __getitem__(self, key: str) -> Any:
+        if key == 'status':
+            return self.status.value
+        return _MappingMixin.__getitem__(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key == 'status':
+            return self.status.value
+        return _MappingMixin.get(self, key, default)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key == 'status':
+            self.status = DownloadStatus(value)
+        elif key == 'error_message':
+            self.error_message = sys.intern(value) if value else ''
+        elif key == 'sha256':
+            self.sha256 = value
+        else:
+            raise KeyError(key)
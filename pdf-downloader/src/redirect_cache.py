@@ -0,0 +1,105 @@
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+class RedirectCache:
+    """
+    Persistent cache over redirect kæder og endelige URLs pr. kilde URL.
+
+    Når en Pdf_URL viderestiller (http til https, link forkortere, CMS
+    download handlers), gemmes den endelige URL, så senere forsøg kan gå
+    direkte til den. Entries udløber efter `ttl` sekunder.
+
+    Attributes:
+        cache_file (Path): JSON fil hvor cachen gemmes mellem kørsler
+        ttl (float): Sekunder en entry er gyldig
+        entries (Dict[str, Dict]): Entry pr. kilde URL
+    """
+
+    def __init__(self, cache_file: Optional[str] = None, ttl: float = 30 * 24 * 3600):
+        """
+        Initialiserer RedirectCache og indlæser tidligere entries hvis filen findes.
+
+        Args:
+            cache_file (str, optional): JSON fil hvor cachen gemmes
+            ttl (float): Sekunder en entry er gyldig
+        """
+        self.cache_file = Path(cache_file) if cache_file else None
+        self.ttl = ttl
+        self.entries: Dict[str, Dict] = {}
+        if self.cache_file and self.cache_file.exists():
+            self.load()
+
+    def get(self, url: str) -> Optional[str]:
+        """
+        Returnerer den cachede endelige URL for en kilde URL.
+
+        Args:
+            url (str): Kilde URL
+
+        Returns:
+            str: Endelig URL, eller None hvis der ikke er en gyldig entry
+        """
+        entry = self.entries.get(url)
+        if entry is None:
+            return None
+        if time.time() - entry['stored_at'] > self.ttl:
+            del self.entries[url]
+            return None
+        return entry['final_url']
+
+    def record(self, url: str, final_url: str, chain: List[str]) -> None:
+        """
+        Gemmer redirect kæden for en kilde URL.
+
+        Args:
+            url (str): Kilde URL
+            final_url (str): URL der til sidst svarede
+            chain (List[str]): Alle URLs i kæden, fra kilden til den endelige URL
+        """
+        if final_url == url:
+            return
+        self.entries[url] = {'final_url': final_url, 'chain': chain, 'stored_at': time.time()}
+
+    def invalidate(self, url: str) -> None:
+        """
+        Fjerner entry for en kilde URL, fx når den cachede URL ikke længere virker.
+
+        Args:
+            url (str): Kilde URL
+        """
+        if self.entries.pop(url, None) is not None:
+            logging.info(f"Invalidated cached redirect for {url}")
+
+    def load(self) -> None:
+        """
+        Indlæser cachen fra cache filen.
+        """
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+            logging.info(f"Loaded {len(self.entries)} cached redirects from {self.cache_file}")
+        except (OSError, ValueError) as e:
+            logging.warning(f"Could not load redirect cache: {e}")
+            self.entries = {}
+
+    def save(self) -> None:
+        """
+        Gemmer cachen til cache filen. Udløbne entries skrives ikke med.
+        """
+        if not self.cache_file:
+            return
+        now = time.time()
+        self.entries = {
+            url: entry for url, entry in self.entries.items()
+            if now - entry['stored_at'] <= self.ttl
+        }
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.cache_file.with_suffix('.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f)
+        tmp_file.replace(self.cache_file)
+        logging.info(f"Saved {len(self.entries)} cached redirects to {self.cache_file}")
@@ -0,0 +1,244 @@
+import csv
+import math
+from pathlib import Path
+from typing import Any, Iterable, Sequence
+
+# Excel's grænse er 1.048.576 rækker inklusive header rækken
+XLSX_MAX_ROWS = 1048575
+
+
+def _clean(value: Any) -> Any:
+    """
+    Normaliserer manglende værdier (None, NaN, NaT) til None.
+    """
+    if value is None:
+        return None
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    if type(value).__name__ in ('NaTType', 'NAType'):
+        return None
+    return value
+
+
+class ReportWriter:
+    """
+    Basisklasse for rapport writers der skriver rækker trinvist i row groups.
+
+    Writers bruges som context manager:
+
+        with get_writer('csv', path, columns) as writer:
+            writer.write_rows(rows)
+
+    Attributes:
+        path (Path): Sti til output filen
+        columns (List[str]): Kolonnenavne i rækkefølge
+        rows_written (int): Antal skrevne rækker
+    """
+
+    extension = ''
+
+    def __init__(self, path: str, columns: Sequence[str]):
+        """
+        Initialiserer writeren.
+
+        Args:
+            path (str): Sti til output filen
+            columns (Sequence[str]): Kolonnenavne i rækkefølge
+        """
+        self.path = Path(path)
+        self.columns = list(columns)
+        self.rows_written = 0
+
+    def write_rows(self, rows: Iterable[Sequence[Any]]) -> None:
+        """
+        Skriver en row group.
+
+        Args:
+            rows (Iterable[Sequence]): Rækker med værdier i samme rækkefølge som columns
+        """
+        raise NotImplementedError
+
+    def write_frame(self, df, row_group_size: int = 10000) -> None:
+        """
+        Skriver en DataFrame i row groups.
+
+        Args:
+            df (pd.DataFrame): DataFrame med de samme kolonner som writeren
+            row_group_size (int): Antal rækker pr. row group
+        """
+        for start in range(0, len(df), row_group_size):
+            chunk = df.iloc[start:start + row_group_size]
+            self.write_rows(chunk.itertuples(index=False, name=None))
+
+    def close(self) -> None:
+        """
+        Afslutter filen.
+        """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class CsvReportWriter(ReportWriter):
+    """
+    Streamende CSV writer baseret på csv modulet.
+    """
+
+    extension = '.csv'
+
+    def __init__(self, path: str, columns: Sequence[str]):
+        super().__init__(path, columns)
+        self._file = open(self.path, 'w', newline='', encoding='utf-8')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(self.columns)
+
+    def write_rows(self, rows: Iterable[Sequence[Any]]) -> None:
+        for row in rows:
+            self._writer.writerow(['' if _clean(v) is None else v for v in row])
+            self.rows_written += 1
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class XlsxReportWriter(ReportWriter):
+    """
+    Write-only xlsx writer, der skriver rækker direkte til filen uden at holde
+    hele regnearket i hukommelsen.
+
+    Raises:
+        ValueError: Hvis der skrives flere rækker end Excel understøtter
+    """
+
+    extension = '.xlsx'
+
+    def __init__(self, path: str, columns: Sequence[str]):
+        from openpyxl import Workbook
+
+        super().__init__(path, columns)
+        self._workbook = Workbook(write_only=True)
+        self._sheet = self._workbook.create_sheet()
+        self._sheet.append(self.columns)
+
+    def write_rows(self, rows: Iterable[Sequence[Any]]) -> None:
+        for row in rows:
+            if self.rows_written >= XLSX_MAX_ROWS:
+                raise ValueError(f"xlsx supports at most {XLSX_MAX_ROWS} rows, use csv or parquet")
+            self._sheet.append([_clean(v) for v in row])
+            self.rows_written += 1
+
+    def close(self) -> None:
+        self._workbook.save(self.path)
+
+
+class ParquetReportWriter(ReportWriter):
+    """
+    Parquet writer der skriver én parquet row group pr. kald til write_rows.
+
+    Rækker skrevet med write_rows gemmes som tekstkolonner. write_frame bruger
+    DataFrame'ens egne typer, undtagen object kolonner der gemmes som tekst.
+
+    Raises:
+        ImportError: Hvis pyarrow ikke er installeret
+    """
+
+    extension = '.parquet'
+
+    def __init__(self, path: str, columns: Sequence[str]):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("Parquet rapporter kræver pyarrow: pip install pyarrow")
+        super().__init__(path, columns)
+        self._pa = pyarrow
+        self._pq = pyarrow.parquet
+        self._writer = None
+
+    def _write_table(self, table) -> None:
+        if self._writer is None:
+            self._writer = self._pq.ParquetWriter(self.path, table.schema)
+        self._writer.write_table(table)
+        self.rows_written += table.num_rows
+
+    def write_rows(self, rows: Iterable[Sequence[Any]]) -> None:
+        data = {column: [] for column in self.columns}
+        for row in rows:
+            for column, value in zip(self.columns, row):
+                value = _clean(value)
+                data[column].append(None if value is None else str(value))
+        schema = self._pa.schema([(column, self._pa.string()) for column in self.columns])
+        self._write_table(self._pa.Table.from_pydict(data, schema=schema))
+
+    def write_frame(self, df, row_group_size: int = 10000) -> None:
+        # Object kolonner fra Excel blander ofte typer (fx 2015 og 'n/a'), som
+        # pyarrow ikke kan udlede en type for. De gemmes derfor som tekst
+        object_columns = [column for column in df.columns if df[column].dtype == object]
+        typed = self._pa.Schema.from_pandas(df.drop(columns=object_columns), preserve_index=False)
+        schema = self._pa.schema([
+            self._pa.field(column, self._pa.string()) if column in object_columns else typed.field(column)
+            for column in df.columns
+        ])
+        for start in range(0, len(df), row_group_size):
+            chunk = df.iloc[start:start + row_group_size]
+            if object_columns:
+                chunk = chunk.assign(**{
+                    column: [None if _clean(v) is None else str(v) for v in chunk[column]]
+                    for column in object_columns
+                })
+            self._write_table(self._pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+    def close(self) -> None:
+        if self._writer is None:
+            # Ingen rækker skrevet: skriv en tom fil med kolonnerne
+            schema = self._pa.schema([(column, self._pa.string()) for column in self.columns])
+            self._writer = self._pq.ParquetWriter(self.path, schema)
+        self._writer.close()
+
+
+WRITERS = {
+    'csv': CsvReportWriter,
+    'xlsx': XlsxReportWriter,
+    'parquet': ParquetReportWriter,
+}
+
+
+def get_writer(report_format: str, path: str, columns: Sequence[str]) -> ReportWriter:
+    """
+    Opretter en writer for det ønskede format.
+
+    Args:
+        report_format (str): 'csv', 'xlsx' eller 'parquet'
+        path (str): Sti til output filen
+        columns (Sequence[str]): Kolonnenavne i rækkefølge
+
+    Returns:
+        ReportWriter: Writer klar til at modtage row groups
+
+    Raises:
+        ValueError: Hvis formatet ikke understøttes
+    """
+    writer_class = WRITERS.get(report_format)
+    if writer_class is None:
+        raise ValueError(f"Unsupported report format: {report_format}")
+    return writer_class(path, columns)
+
+
+def format_for_path(path: str) -> str:
+    """
+    Udleder rapport formatet fra en fils endelse.
+
+    Args:
+        path (str): Sti til output filen
+
+    Returns:
+        str: 'csv', 'xlsx' eller 'parquet' (xlsx hvis endelsen er ukendt)
+    """
+    suffix = Path(path).suffix.lower()
+    for report_format, writer_class in WRITERS.items():
+        if writer_class.extension == suffix:
+            return report_format
+    return 'xlsx'
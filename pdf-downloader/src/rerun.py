@@ -0,0 +1,88 @@
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from .status_tracker import REPORT_COLUMNS
+from .utils import classify_error, get_host
+
+
+def load_status_report(report_path: str) -> List[Dict]:
+    """
+    Indlæser en tidligere download_status rapport som download resultater.
+
+    Formatet (xlsx, csv eller parquet) udledes af filens endelse, og
+    kolonnerne oversættes tilbage til resultatfelterne.
+
+    Args:
+        report_path (str): Sti til download_status_* rapporten
+
+    Returns:
+        List[Dict]: Resultater med felterne br_number, status, primary_url,
+            alternative_url, error_message og timestamp
+
+    Raises:
+        FileNotFoundError: Hvis rapporten ikke findes
+        ValueError: Hvis filen ikke har status rapportens kolonner
+    """
+    import pandas as pd
+
+    path = Path(report_path)
+    if not path.exists():
+        raise FileNotFoundError(f"Status rapport ikke fundet: {report_path}")
+
+    suffix = path.suffix.lower()
+    if suffix == '.csv':
+        df = pd.read_csv(path, dtype=str, keep_default_na=False)
+    elif suffix == '.parquet':
+        df = pd.read_parquet(path)
+    else:
+        df = pd.read_excel(path, dtype=str)
+
+    missing = [column for column, _ in REPORT_COLUMNS if column not in df.columns]
+    if missing:
+        raise ValueError(f"Not a status report, missing columns: {', '.join(missing)}")
+
+    df = df.rename(columns=dict(REPORT_COLUMNS))
+    df = df.astype(object).where(df.notna(), None)
+    results = df[[key for _, key in REPORT_COLUMNS]].to_dict('records')
+    logging.info(f"Loaded {len(results)} results from {report_path}")
+    return results
+
+
+def select_for_rerun(results: Iterable[Dict], statuses: Optional[Iterable[str]] = None,
+                     error_classes: Optional[Iterable[str]] = None,
+                     hosts: Optional[Iterable[str]] = None) -> List[str]:
+    """
+    Vælger de BR numre fra en tidligere kørsel der skal forsøges igen.
+
+    Alle angivne filtre skal være opfyldt. Et filter der ikke er angivet
+    matcher alt.
+
+    Args:
+        results (Iterable[Dict]): Tidligere download resultater
+        statuses (Iterable[str], optional): Statusser der skal med, fx ['failed']
+        error_classes (Iterable[str], optional): Fejlklasser fra classify_error,
+            fx ['timeout', 'http_5xx']
+        hosts (Iterable[str], optional): Hosts for primær eller alternativ URL
+
+    Returns:
+        List[str]: BR numre i rapportens rækkefølge uden dubletter
+    """
+    statuses = set(statuses) if statuses else None
+    error_classes = set(error_classes) if error_classes else None
+    hosts = {host.lower() for host in hosts} if hosts else None
+
+    selected = {}
+    for result in results:
+        if statuses is not None and result['status'] not in statuses:
+            continue
+        if error_classes is not None and classify_error(result['error_message']) not in error_classes:
+            continue
+        if hosts is not None:
+            result_hosts = {get_host(result['primary_url']), get_host(result['alternative_url'])}
+            if not result_hosts & hosts:
+                continue
+        selected[str(result['br_number'])] = None
+
+    logging.info(f"Selected {len(selected)} BR numbers for rerun")
+    return list(selected)
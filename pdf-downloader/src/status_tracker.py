@@ -1,8 +1,29 @@
-import pandas as pd
 from pathlib import Path
 import logging
 from typing import List, Dict
 from datetime import datetime
+from .report_writers import XLSX_MAX_ROWS, get_writer, WRITERS
+
+# Kolonner i status rapporten og de resultatfelter de hentes fra
+REPORT_COLUMNS = [
+    ('BR Nummer', 'br_number'),
+    ('Status', 'status'),
+    ('Primær URL', 'primary_url'),
+    ('Alternativ URL', 'alternative_url'),
+    ('Fejlbesked', 'error_message'),
+    ('Tidspunkt', 'timestamp')
+]
+
+# Kolonner i proxy rapporten og de statistikfelter de hentes fra
+PROXY_COLUMNS = [
+    ('Proxy', 'proxy'),
+    ('Requests', 'requests'),
+    ('Fejl', 'errors'),
+    ('Proxy fejl', 'proxy_failures'),
+    ('Bytes', 'bytes'),
+    ('Gns. varighed (ms)', 'mean_request_ms'),
+    ('KB/s', 'throughput_kbps')
+]
 
 class StatusTracker:
     """
@@ -11,18 +32,28 @@ class StatusTracker:
     Attributes:
         report_dir (str): Sti hvor rapporter gemmes
         results (List[Dict]): Liste af download resultater
+        report_format (str): Format for status rapporten ('xlsx', 'csv' eller 'parquet')
+        row_group_size (int): Antal rækker der skrives ad gangen
+        proxy_stats (List[Dict]): Statistik pr. proxy, hvis der er brugt en proxy pulje
     """
     
-    def __init__(self, report_dir: str):
+    def __init__(self, report_dir: str, report_format: str = 'xlsx', row_group_size: int = 10000):
         """
         Initialiserer StatusTracker.
         
         Args:
             report_dir (str): Sti hvor rapporter skal gemmes
+            report_format (str): Format for status rapporten ('xlsx', 'csv' eller 'parquet')
+            row_group_size (int): Antal rækker der skrives ad gangen
         """
+        if report_format not in WRITERS:
+            raise ValueError(f"Unsupported report format: {report_format}")
         self.report_dir = Path(report_dir)
         self.report_dir.mkdir(parents=True, exist_ok=True)
+        self.report_format = report_format
+        self.row_group_size = row_group_size
         self.results = []
+        self.proxy_stats = []
         
     def update(self, result: Dict) -> None:
         """
@@ -43,41 +74,90 @@ class StatusTracker:
         """
         self.results.extend(batch_results)
         
-    def generate_report(self) -> None:
+    def update_proxy_stats(self, proxy_stats: List[Dict]) -> None:
+        """
+        Gemmer statistik pr. proxy til rapporten.
+        
+        Args:
+            proxy_stats (List[Dict]): Rækker fra ProxyPool.stats
         """
-        Genererer en Excel rapport med download status.
+        self.proxy_stats = list(proxy_stats)
+        
+    def generate_report(self, xlsx_export: bool = False) -> Path:
+        """
+        Genererer en rapport med download status.
+        
+        Rapporten skrives trinvist i row groups direkte fra resultaterne, uden
+        at bygge en samlet DataFrame. Er der proxy statistik, skrives den i en
+        proxy_stats fil med samme tidsstempel og format.
+        
+        Args:
+            xlsx_export (bool): Skriv også en xlsx kopi når formatet ikke er xlsx
+            
+        Returns:
+            Path: Sti til den genererede rapport
         """
         if not self.results:
             logging.warning("No results to generate report from")
-            # Opret en tom rapport med korrekte kolonner
-            df = pd.DataFrame(columns=[
-                'BR Nummer',
-                'Status',
-                'Primær URL',
-                'Alternativ URL',
-                'Fejlbesked',
-                'Tidspunkt'
-            ])
-        else:
-            # Konverter resultater til DataFrame
-            df = pd.DataFrame([
-                {
-                    'BR Nummer': r['br_number'],
-                    'Status': r['status'],
-                    'Primær URL': r['primary_url'],
-                    'Alternativ URL': r['alternative_url'],
-                    'Fejlbesked': r['error_message'],
-                    'Tidspunkt': r['timestamp']
-                }
-                for r in self.results
-            ])
         
         # Gem rapport
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        report_path = self.report_dir / f'download_status_{timestamp}.xlsx'
-        df.to_excel(report_path, index=False)
+        report_path = self._write_report(self.report_format, timestamp)
         logging.info(f"Status report generated: {report_path}")
         
+        if self.proxy_stats:
+            proxy_path = self._write_proxy_stats(self.report_format, timestamp)
+            logging.info(f"Proxy statistics written to: {proxy_path}")
+        
+        # Valgfri xlsx eksport til dem der åbner rapporten i Excel
+        if xlsx_export and self.report_format != 'xlsx':
+            if len(self.results) > XLSX_MAX_ROWS:
+                logging.warning(f"Skipping xlsx export: {len(self.results)} rows exceeds the xlsx limit")
+            else:
+                export_path = self._write_report('xlsx', timestamp)
+                logging.info(f"Status report exported to: {export_path}")
+        
+        return report_path
+    
+    def _write_report(self, report_format: str, timestamp: str) -> Path:
+        """
+        Skriver status rapporten i det angivne format.
+        
+        Args:
+            report_format (str): 'xlsx', 'csv' eller 'parquet'
+            timestamp (str): Tidsstempel til filnavnet
+            
+        Returns:
+            Path: Sti til rapporten
+        """
+        writer_class = WRITERS[report_format]
+        report_path = self.report_dir / f'download_status_{timestamp}{writer_class.extension}'
+        with get_writer(report_format, report_path, [column for column, _ in REPORT_COLUMNS]) as writer:
+            for start in range(0, len(self.results), self.row_group_size):
+                group = self.results[start:start + self.row_group_size]
+                writer.write_rows(
+                    [r.get(key) for _, key in REPORT_COLUMNS]
+                    for r in group
+                )
+        return report_path
+    
+    def _write_proxy_stats(self, report_format: str, timestamp: str) -> Path:
+        """
+        Skriver statistik pr. proxy i det angivne format.
+        
+        Args:
+            report_format (str): 'xlsx', 'csv' eller 'parquet'
+            timestamp (str): Tidsstempel til filnavnet
+            
+        Returns:
+            Path: Sti til filen
+        """
+        writer_class = WRITERS[report_format]
+        stats_path = self.report_dir / f'proxy_stats_{timestamp}{writer_class.extension}'
+        with get_writer(report_format, stats_path, [column for column, _ in PROXY_COLUMNS]) as writer:
+            writer.write_rows([row.get(key) for _, key in PROXY_COLUMNS] for row in self.proxy_stats)
+        return stats_path
+        
     def get_statistics(self) -> dict:
         """
         Beregner statistik over download resultater.
@@ -0,0 +1,256 @@
+import hashlib
+import io
+import json
+import logging
+import os
+import tarfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+LAYOUTS = ('flat', 'hash', 'year')
+
+# Navn på indeksfilen i output mappen
+INDEX_FILE = 'index.jsonl'
+
+
+class PDFStore:
+    """
+    Bestemmer hvor downloadede PDFs gemmes og finder dem igen ud fra BR nummer.
+
+    Layouts:
+        flat: {output_dir}/{br_number}.pdf
+        hash: {output_dir}/ab/cd/{br_number}.pdf, hvor ab/cd er starten af sha1(br_number)
+        year: {output_dir}/{year}/{br_number}.pdf
+
+    I pakket tilstand skrives PDFs i stedet til rullende tar shards af fast
+    størrelse. Placeringen af hver PDF (shard, offset, størrelse) skrives til
+    en indeksfil, så en rapport kan læses direkte uden at scanne arkiverne.
+
+    Attributes:
+        output_dir (Path): Rodmappe for PDFs, shards og indeks
+        layout (str): 'flat', 'hash' eller 'year'
+        packed (bool): Om PDFs pakkes i tar shards
+        shard_size (int): Maksimal størrelse af en shard i bytes
+    """
+
+    def __init__(self, output_dir: str, layout: str = 'flat', packed: bool = False,
+                 shard_size: int = 1024 * 1024 * 1024):
+        """
+        Initialiserer PDFStore.
+
+        Args:
+            output_dir (str): Rodmappe for PDFs, shards og indeks
+            layout (str): 'flat', 'hash' eller 'year'
+            packed (bool): Pak PDFs i rullende tar shards
+            shard_size (int): Maksimal størrelse af en shard i bytes
+
+        Raises:
+            ValueError: Hvis layoutet ikke understøttes
+        """
+        if layout not in LAYOUTS:
+            raise ValueError(f"Unsupported layout: {layout}")
+        self.output_dir = Path(output_dir)
+        self.layout = layout
+        self.packed = packed
+        self.shard_size = shard_size
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self._created_dirs = set()
+        self._index: Optional[Dict[str, Dict]] = None
+        self._index_file = None
+        self._lock = threading.Lock()
+        self._shard = None
+        self._shard_file = None
+        self._shard_number = -1
+
+    @property
+    def uses_index(self) -> bool:
+        """
+        True hvis placeringer ikke kan beregnes ud fra BR nummeret alene.
+        """
+        return self.packed or self.layout == 'year'
+
+    def path_for(self, br_number: str, year: Optional[str] = None) -> Path:
+        """
+        Returnerer stien hvor en PDF skal gemmes, og opretter mappen ved behov.
+
+        Args:
+            br_number (str): BR nummer
+            year (str, optional): Rapportens år (bruges af year layoutet)
+
+        Returns:
+            Path: Sti til PDF filen
+        """
+        if self.layout == 'hash':
+            digest = hashlib.sha1(br_number.encode('utf-8')).hexdigest()
+            directory = self.output_dir / digest[:2] / digest[2:4]
+        elif self.layout == 'year':
+            directory = self.output_dir / (year or 'unknown')
+        else:
+            directory = self.output_dir
+        if directory not in self._created_dirs:
+            directory.mkdir(parents=True, exist_ok=True)
+            self._created_dirs.add(directory)
+        return directory / f'{br_number}.pdf'
+
+    def record(self, br_number: str, path: Path) -> None:
+        """
+        Registrerer en gemt fil i indekset hvis layoutet kræver det.
+
+        Args:
+            br_number (str): BR nummer
+            path (Path): Sti hvor filen blev gemt
+        """
+        if self.uses_index:
+            self._append_index({'br_number': br_number, 'path': str(path.relative_to(self.output_dir))})
+
+    def add_packed(self, br_number: str, content: bytes) -> str:
+        """
+        Tilføjer en PDF til den aktuelle tar shard. Kan kaldes fra flere tråde.
+
+        Args:
+            br_number (str): BR nummer
+            content (bytes): PDF indhold
+
+        Returns:
+            str: sha256 hex digest af indholdet
+        """
+        digest = hashlib.sha256(content).hexdigest()
+        with self._lock:
+            shard = self._current_shard(len(content))
+            info = tarfile.TarInfo(f'{br_number}.pdf')
+            info.size = len(content)
+            info.mtime = int(time.time())
+            # Data ligger lige efter headeren, så offset kan beregnes før skrivning
+            offset = shard.offset + len(info.tobuf(shard.format, shard.encoding, shard.errors))
+            shard.addfile(info, io.BytesIO(content))
+            # Indekslinjen må ikke nå disken før de data den peger på
+            self._shard_file.flush()
+            self._append_index({
+                'br_number': br_number,
+                'shard': Path(shard.name).name,
+                'offset': offset,
+                'size': info.size,
+                'sha256': digest
+            })
+        return digest
+
+    def _current_shard(self, incoming: int) -> tarfile.TarFile:
+        """
+        Returnerer den åbne shard og ruller til en ny hvis den ville blive for stor.
+        """
+        if self._shard is not None and self._shard.offset + incoming > self.shard_size:
+            self._close_shard()
+        if self._shard is None:
+            self._shard_number += 1
+            shard_path = self.output_dir / f'pdfs-{self._shard_number:05d}.tar'
+            # Spring shards fra tidligere kørsler over
+            while shard_path.exists():
+                self._shard_number += 1
+                shard_path = self.output_dir / f'pdfs-{self._shard_number:05d}.tar'
+            self._shard_file = open(shard_path, 'wb')
+            self._shard = tarfile.open(shard_path, 'w', fileobj=self._shard_file)
+            logging.info(f"Opened archive shard {shard_path}")
+        return self._shard
+
+    def _close_shard(self) -> None:
+        """
+        Lukker den aktuelle shard og synkroniserer den til disk.
+        """
+        if self._shard is not None:
+            # Én fsync pr. shard i stedet for én pr. PDF
+            self._shard.close()
+            self._shard_file.flush()
+            os.fsync(self._shard_file.fileno())
+            self._shard_file.close()
+            self._shard = None
+            self._shard_file = None
+            if self._index_file is not None:
+                self._index_file.flush()
+                os.fsync(self._index_file.fileno())
+
+    def _append_index(self, entry: Dict) -> None:
+        """
+        Tilføjer en linje til indeksfilen og opdaterer det indlæste indeks.
+
+        Linjen flushes med det samme, så den ikke går tabt hvis kørslen
+        afbrydes. fsync sker først når en shard lukkes.
+        """
+        if self._index_file is None:
+            self._index_file = open(self.output_dir / INDEX_FILE, 'a', encoding='utf-8')
+        self._index_file.write(json.dumps(entry) + '\n')
+        self._index_file.flush()
+        if self._index is not None:
+            self._index[entry['br_number']] = entry
+
+    def _load_index(self) -> Dict[str, Dict]:
+        """
+        Indlæser indeksfilen. Den seneste linje for et BR nummer vinder.
+        """
+        if self._index is None:
+            if self._index_file is not None:
+                self._index_file.flush()
+            self._index = {}
+            index_path = self.output_dir / INDEX_FILE
+            if index_path.exists():
+                with open(index_path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        if line.strip():
+                            entry = json.loads(line)
+                            self._index[entry['br_number']] = entry
+        return self._index
+
+    def locate(self, br_number: str) -> Optional[Dict]:
+        """
+        Finder en rapport ud fra BR nummer uden at scanne output mappen.
+
+        Args:
+            br_number (str): BR nummer
+
+        Returns:
+            Dict: {'path': Path} for løse filer eller {'shard': Path, 'offset': int,
+                'size': int} for pakkede filer. None hvis rapporten ikke findes.
+        """
+        entry = self._load_index().get(br_number)
+        if entry is not None:
+            if 'shard' in entry:
+                return {'shard': self.output_dir / entry['shard'], 'offset': entry['offset'], 'size': entry['size']}
+            return {'path': self.output_dir / entry['path']}
+        if not self.uses_index:
+            path = self.path_for(br_number)
+            if path.exists():
+                return {'path': path}
+        return None
+
+    def read(self, br_number: str) -> Optional[bytes]:
+        """
+        Læser en rapport ud fra BR nummer.
+
+        Args:
+            br_number (str): BR nummer
+
+        Returns:
+            bytes: PDF indhold, eller None hvis rapporten ikke findes
+        """
+        location = self.locate(br_number)
+        if location is None:
+            return None
+        if 'path' in location:
+            return location['path'].read_bytes()
+        with self._lock:
+            if self._shard_file is not None:
+                self._shard_file.flush()
+        with open(location['shard'], 'rb') as f:
+            f.seek(location['offset'])
+            return f.read(location['size'])
+
+    def close(self) -> None:
+        """
+        Lukker den åbne shard og indeksfilen.
+        """
+        with self._lock:
+            self._close_shard()
+            if self._index_file is not None:
+                self._index_file.close()
+                self._index_file = None
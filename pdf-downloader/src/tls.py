@@ -0,0 +1,300 @@
+import logging
+import ssl
+import time
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import aiohttp
+
+try:
+    import certifi
+except ImportError:  # certifi er valgfri; uden den bruges systemets certifikater
+    certifi = None
+
+
+# Maksimalt antal TLS sessioner der gemmes pr. context
+MAX_SESSIONS = 10000
+
+# Alle contexts oprettet af create_ssl_context, så statistikken kan samles
+_contexts: List['ResumingSSLContext'] = []
+
+
+class ResumingSSLObject(ssl.SSLObject):
+    """
+    SSLObject der gemmer sin TLS session i contexten, så næste forbindelse til
+    samme host kan genoptage den i stedet for et fuldt handshake.
+
+    Med TLS 1.3 kommer session ticketet først efter handshaket, så sessionen
+    gemmes også ved første læsning.
+    """
+
+    def do_handshake(self) -> None:
+        if not hasattr(self, '_handshake_started'):
+            self._handshake_started = time.perf_counter()
+        super().do_handshake()
+        self.context._handshake_done(self, time.perf_counter() - self._handshake_started)
+        self._remember_session()
+
+    def read(self, *args, **kwargs):
+        data = super().read(*args, **kwargs)
+        if not getattr(self, '_session_saved', False):
+            self._remember_session()
+        return data
+
+    def _remember_session(self) -> None:
+        session = self.session
+        if session is not None and (session.has_ticket or self.version() != 'TLSv1.3'):
+            self.context._store_session(self.server_hostname, session)
+            self._session_saved = True
+
+
+class ResumingSSLContext(ssl.SSLContext):
+    """
+    SSLContext med en klient-side session cache pr. hostnavn.
+
+    asyncio giver ingen mulighed for at angive en session pr. forbindelse, så
+    contexten indsætter selv den gemte session når asyncio opretter
+    SSLObject'et. Contexten tæller også fulde og genoptagne handshakes.
+
+    Attributes:
+        full_handshakes (int): Handshakes uden genoptaget session
+        resumed_handshakes (int): Handshakes der genoptog en session
+        full_handshake_time (float): Samlet tid for fulde handshakes i sekunder
+        resumed_handshake_time (float): Samlet tid for genoptagne handshakes i sekunder
+    """
+
+    sslobject_class = ResumingSSLObject
+
+    def __new__(cls, *args, **kwargs):
+        self = super().__new__(cls, *args, **kwargs)
+        self._sessions: Dict[str, ssl.SSLSession] = {}
+        self.full_handshakes = 0
+        self.resumed_handshakes = 0
+        self.full_handshake_time = 0.0
+        self.resumed_handshake_time = 0.0
+        return self
+
+    def wrap_bio(self, incoming, outgoing, server_side=False, server_hostname=None, session=None):
+        if session is None and server_hostname:
+            session = self._sessions.get(server_hostname)
+        return super().wrap_bio(incoming, outgoing, server_side, server_hostname, session)
+
+    def _store_session(self, host: Optional[str], session: ssl.SSLSession) -> None:
+        if not host:
+            return
+        if host not in self._sessions and len(self._sessions) >= MAX_SESSIONS:
+            del self._sessions[next(iter(self._sessions))]
+        self._sessions[host] = session
+
+    def _handshake_done(self, sslobj: ssl.SSLObject, duration: float) -> None:
+        if sslobj.session_reused:
+            self.resumed_handshakes += 1
+            self.resumed_handshake_time += duration
+        else:
+            self.full_handshakes += 1
+            self.full_handshake_time += duration
+
+
+@lru_cache(maxsize=None)
+def create_ssl_context(verify: bool = True, alpn: Tuple[str, ...] = ()) -> ResumingSSLContext:
+    """
+    Returnerer en delt SSLContext. Hver kombination bygges kun én gang, så
+    certifikatlageret indlæses én gang og TLS sessioner deles mellem alle
+    forbindelser der bruger contexten.
+
+    Args:
+        verify (bool): Verificer certifikat og hostnavn
+        alpn (Tuple[str, ...]): ALPN protokoller der tilbydes, fx ('h2', 'http/1.1')
+
+    Returns:
+        ResumingSSLContext: Konfigureret context
+    """
+    context = ResumingSSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    cafile = None
+    if verify:
+        # Uden verifikation sættes ingen minimumsversion, så ældre hosts på
+        # --insecure-hosts, der kun taler TLS 1.0/1.1, stadig kan hentes
+        context.minimum_version = ssl.TLSVersion.TLSv1_2
+        cafile = certifi.where() if certifi else None
+        if cafile:
+            context.load_verify_locations(cafile)
+        else:
+            context.load_default_certs()
+    else:
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    if alpn:
+        context.set_alpn_protocols(list(alpn))
+    _contexts.append(context)
+    logging.debug(f"Created SSL context (verify={verify}, alpn={alpn}, cafile={cafile or 'system'})")
+    return context
+
+
+@lru_cache(maxsize=None)
+def create_probe_context(alpn: Tuple[str, ...]) -> ssl.SSLContext:
+    """
+    Returnerer en almindelig SSLContext til ALPN prober.
+
+    Proben afgør kun protokollen, så certifikatet verificeres ikke. Contexten
+    er ikke en ResumingSSLContext og registreres ikke i _contexts, så probe
+    handshakes ikke tælles med i handshake statistikken.
+
+    Args:
+        alpn (Tuple[str, ...]): ALPN protokoller der tilbydes
+
+    Returns:
+        ssl.SSLContext: Context uden verifikation
+    """
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    context.minimum_version = ssl.TLSVersion.TLSv1_2
+    context.check_hostname = False
+    context.verify_mode = ssl.CERT_NONE
+    context.set_alpn_protocols(list(alpn))
+    return context
+
+
+def _handshake_totals() -> Tuple[int, int, float, float]:
+    """
+    Summerer handshake tællerne for alle contexts.
+    """
+    return (
+        sum(c.full_handshakes for c in _contexts),
+        sum(c.resumed_handshakes for c in _contexts),
+        sum(c.full_handshake_time for c in _contexts),
+        sum(c.resumed_handshake_time for c in _contexts)
+    )
+
+
+def host_matches(host: Optional[str], patterns: Iterable[str]) -> bool:
+    """
+    Tjekker om en host står på en liste. Et mønster der starter med punktum
+    eller '*.' matcher også alle underdomæner.
+
+    Args:
+        host (str): Hostnavn i små bogstaver
+        patterns (Iterable[str]): Hosts eller domænemønstre
+
+    Returns:
+        bool: True hvis hosten matcher et af mønstrene
+    """
+    if not host:
+        return False
+    for pattern in patterns:
+        if pattern.startswith('*.'):
+            pattern = pattern[1:]
+        if pattern.startswith('.'):
+            if host == pattern[1:] or host.endswith(pattern):
+                return True
+        elif host == pattern:
+            return True
+    return False
+
+
+class ConnectionStats:
+    """
+    Tæller nye og genbrugte forbindelser via aiohttp's trace hooks.
+
+    Connect tiden for nye forbindelser måles uden DNS opslaget, så den dækker
+    TCP og TLS handshake. Genbrugte HTTPS forbindelser sparer hele connect
+    tiden, og genoptagne TLS sessioner sparer forskellen mellem et fuldt og et
+    genoptaget handshake. Begge dele indgår i den estimerede sparede tid.
+
+    Attributes:
+        new_connections (int): Nye forbindelser i alt
+        new_tls_connections (int): Nye HTTPS forbindelser
+        reused_connections (int): Requests der genbrugte en forbindelse
+        reused_tls_connections (int): HTTPS requests der genbrugte en forbindelse
+        handshake_time (float): Samlet connect tid for nye HTTPS forbindelser i sekunder
+    """
+
+    def __init__(self):
+        """
+        Initialiserer ConnectionStats.
+        """
+        self.new_connections = 0
+        self.new_tls_connections = 0
+        self.reused_connections = 0
+        self.reused_tls_connections = 0
+        self.handshake_time = 0.0
+        self._baseline = _handshake_totals()
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        """
+        Opretter en TraceConfig der opdaterer statistikken.
+
+        Returns:
+            aiohttp.TraceConfig: Gives til aiohttp.ClientSession(trace_configs=[...])
+        """
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(self._on_request_start)
+        trace_config.on_connection_create_start.append(self._on_create_start)
+        trace_config.on_dns_resolvehost_start.append(self._on_dns_start)
+        trace_config.on_dns_resolvehost_end.append(self._on_dns_end)
+        trace_config.on_connection_create_end.append(self._on_create_end)
+        trace_config.on_connection_reuseconn.append(self._on_reuse)
+        return trace_config
+
+    async def _on_request_start(self, session, ctx, params) -> None:
+        ctx.tls = params.url.scheme == 'https'
+
+    async def _on_create_start(self, session, ctx, params) -> None:
+        ctx.connect_started = time.perf_counter()
+        ctx.dns_time = 0.0
+
+    async def _on_dns_start(self, session, ctx, params) -> None:
+        ctx.dns_started = time.perf_counter()
+
+    async def _on_dns_end(self, session, ctx, params) -> None:
+        ctx.dns_time = time.perf_counter() - ctx.dns_started
+
+    async def _on_create_end(self, session, ctx, params) -> None:
+        self.new_connections += 1
+        if ctx.tls:
+            self.new_tls_connections += 1
+            self.handshake_time += time.perf_counter() - ctx.connect_started - ctx.dns_time
+
+    async def _on_reuse(self, session, ctx, params) -> None:
+        self.reused_connections += 1
+        if ctx.tls:
+            self.reused_tls_connections += 1
+
+    def snapshot(self) -> Dict[str, float]:
+        """
+        Returnerer statistik over forbindelserne.
+
+        Returns:
+            Dict: Nye og genbrugte forbindelser, fulde og genoptagne TLS
+                handshakes, gennemsnitstider og estimeret sparet tid i millisekunder
+        """
+        full, resumed, full_time, resumed_time = (
+            now - before for now, before in zip(_handshake_totals(), self._baseline)
+        )
+        mean_connect = self.handshake_time / self.new_tls_connections if self.new_tls_connections else 0.0
+        mean_full = full_time / full if full else 0.0
+        mean_resumed = resumed_time / resumed if resumed else 0.0
+        saved = mean_connect * self.reused_tls_connections + max(0.0, mean_full - mean_resumed) * resumed
+        return {
+            'new_connections': self.new_connections,
+            'reused_connections': self.reused_connections,
+            'new_tls_connections': self.new_tls_connections,
+            'reused_tls_connections': self.reused_tls_connections,
+            'full_handshakes': full,
+            'resumed_handshakes': resumed,
+            'mean_connect_ms': mean_connect * 1000,
+            'mean_full_handshake_ms': mean_full * 1000,
+            'mean_resumed_handshake_ms': mean_resumed * 1000,
+            'saved_handshake_ms': saved * 1000
+        }
+
+    def log(self) -> None:
+        """
+        Logger forbindelsesstatistikken.
+        """
+        stats = self.snapshot()
+        logging.info(
+            f"Connections: {stats['new_connections']} new, {stats['reused_connections']} reused; "
+            f"TLS handshakes: {stats['full_handshakes']} full "
+            f"(mean {stats['mean_full_handshake_ms']:.1f} ms), {stats['resumed_handshakes']} resumed "
+            f"(mean {stats['mean_resumed_handshake_ms']:.1f} ms); "
+            f"estimated {stats['saved_handshake_ms'] / 1000:.1f} s handshake time saved"
+        )
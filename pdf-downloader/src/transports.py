@@ -0,0 +1,186 @@
+import asyncio
+import logging
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+from .tls import create_probe_context, create_ssl_context
+
+# httpx er valgfri og kun nødvendig for HTTP/2. Den importeres først når en
+# Http2Transport oprettes, så en kørsel uden --http2 ikke betaler for importen
+httpx = None
+
+
+def _load_httpx():
+    """
+    Importerer httpx første gang den skal bruges.
+
+    Returns:
+        httpx modulet, eller None hvis det ikke er installeret
+    """
+    global httpx
+    if httpx is None:
+        try:
+            import httpx as module
+        except ImportError:
+            return None
+        httpx = module
+    return httpx
+
+
+def http2_connect_errors() -> tuple:
+    """
+    Returnerer de httpx fejl der tæller som connect-fejl eller timeout i host
+    circuit breakeren. Tom så længe httpx ikke er importeret, for så kan de
+    ikke opstå.
+    """
+    return (httpx.TransportError,) if httpx is not None else ()
+
+
+class Http2Response:
+    """
+    Tilpasser et httpx svar til den del af aiohttp's response interface som
+    PDFDownloader bruger (status, headers, read og async context manager).
+    """
+
+    def __init__(self, response):
+        self._response = response
+        self.status = response.status_code
+        self.headers = response.headers
+        self.url = str(response.url)
+        self.history = response.history
+        self.http_version = response.http_version
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self._response.aclose()
+
+    async def read(self) -> bytes:
+        return await self._response.aread()
+
+
+class Http2Transport:
+    """
+    HTTP/2 backend baseret på httpx, der multiplexer mange streams over én
+    forbindelse pr. host.
+
+    Backenden har samme `get(url, timeout=...)` interface som en
+    aiohttp.ClientSession, så PDFDownloader kan vælge transport pr. host. Om en
+    host bruger HTTP/2 afgøres med en ALPN probe, som caches for hele kørslen.
+
+    Attributes:
+        max_connections (int): Maksimalt antal forbindelser i alt
+        probe_timeout (float): Timeout i sekunder for ALPN proben
+        protocols (Dict[str, str]): Forhandlet protokol pr. host
+    """
+
+    def __init__(self, max_connections: int = 100, probe_timeout: float = 5):
+        """
+        Initialiserer Http2Transport.
+
+        Args:
+            max_connections (int): Maksimalt antal forbindelser i alt
+            probe_timeout (float): Timeout i sekunder for ALPN proben
+
+        Raises:
+            ImportError: Hvis httpx eller h2 pakken ikke er installeret
+        """
+        if _load_httpx() is None:
+            raise ImportError("HTTP/2 kræver httpx: pip install 'httpx[http2]'")
+        self.max_connections = max_connections
+        self.probe_timeout = probe_timeout
+        self.protocols: Dict[str, str] = {}
+        self._probes: Dict[str, asyncio.Future] = {}
+        self._client = None
+        # Klienten bygges med det samme, så en manglende h2 pakke stopper
+        # kørslen ved opstart i stedet for at fejle hver URL på en h2 host
+        try:
+            self._get_client()
+        except ImportError as e:
+            raise ImportError("HTTP/2 kræver h2 pakken: pip install 'httpx[http2]'") from e
+
+    def _get_client(self):
+        """
+        Returnerer httpx klienten og opretter den igen efter close.
+        """
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                http2=True,
+                verify=create_ssl_context(alpn=('h2', 'http/1.1')),
+                follow_redirects=True,
+                limits=httpx.Limits(max_connections=self.max_connections)
+            )
+        return self._client
+
+    async def supports(self, url: str) -> bool:
+        """
+        Afgør om en URL's host forhandler HTTP/2 via ALPN.
+
+        Args:
+            url (str): URL der skal hentes
+
+        Returns:
+            bool: True hvis hosten skal hentes over HTTP/2
+        """
+        parts = urlsplit(url)
+        if parts.scheme != 'https' or not parts.hostname:
+            return False
+        host = parts.hostname.lower()
+        if host not in self.protocols:
+            probe = self._probes.get(host)
+            if probe is None:
+                probe = asyncio.ensure_future(self._probe_alpn(host, parts.port or 443))
+                self._probes[host] = probe
+            self.protocols[host] = await probe
+            self._probes.pop(host, None)
+        return self.protocols[host] == 'h2'
+
+    async def _probe_alpn(self, host: str, port: int) -> str:
+        """
+        Åbner en TLS forbindelse og returnerer den protokol serveren vælger.
+
+        Returns:
+            str: 'h2', 'http/1.1' eller '' hvis proben fejlede
+        """
+        # Proben afgør kun protokollen; certifikatet verificeres af klienten
+        context = create_probe_context(('h2', 'http/1.1'))
+        writer = None
+        try:
+            _, writer = await asyncio.wait_for(
+                asyncio.open_connection(host, port, ssl=context, server_hostname=host),
+                timeout=self.probe_timeout
+            )
+            protocol = writer.get_extra_info('ssl_object').selected_alpn_protocol() or ''
+        except (OSError, asyncio.TimeoutError) as e:
+            logging.debug(f"ALPN probe failed for {host}: {e}")
+            protocol = ''
+        finally:
+            if writer is not None:
+                writer.close()
+        logging.debug(f"ALPN for {host}: {protocol or 'none'}")
+        return protocol
+
+    async def get(self, url: str, timeout: Optional[float] = None) -> Http2Response:
+        """
+        Henter en URL over HTTP/2.
+
+        Args:
+            url (str): URL der skal hentes
+            timeout (float, optional): Timeout i sekunder
+
+        Returns:
+            Http2Response: Svar med aiohttp-kompatibelt interface
+        """
+        client = self._get_client()
+        request = client.build_request('GET', url, timeout=timeout)
+        response = await client.send(request, stream=True)
+        return Http2Response(response)
+
+    async def close(self) -> None:
+        """
+        Lukker httpx klienten og dens forbindelser.
+        """
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
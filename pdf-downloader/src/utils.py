@@ -0,0 +1,55 @@
+import re
+from typing import Optional
+from urllib.parse import urlsplit
+
+# Fejlklasser i prioriteret rækkefølge. Første mønster der matcher fejlbeskeden vinder.
+ERROR_PATTERNS = [
+    ('dns', re.compile(r'DNS lookup failed|Name or service not known|nodename nor servname|getaddrinfo', re.I)),
+    ('circuit_open', re.compile(r'Circuit open', re.I)),
+    ('timeout', re.compile(r'timeout|timed out', re.I)),
+    ('http_5xx', re.compile(r'HTTP 5\d\d')),
+    ('tls', re.compile(r'certificate verify failed|CertificateError|SSLCertVerificationError', re.I)),
+    ('connection', re.compile(r'Cannot connect|Connection (refused|reset|aborted)|Server disconnected|SSL|ClientConnect', re.I)),
+    ('http_4xx', re.compile(r'HTTP 4\d\d')),
+    ('non_pdf', re.compile(r'Non-PDF content', re.I)),
+    ('invalid_pdf', re.compile(r'Invalid PDF', re.I)),
+]
+
+ERROR_CLASSES = [name for name, _ in ERROR_PATTERNS] + ['other']
+
+
+def get_host(url: Optional[str]) -> Optional[str]:
+    """
+    Udtrækker hostnavnet fra en URL.
+
+    Args:
+        url (str): URL at udtrække host fra
+
+    Returns:
+        str: Hostnavn i små bogstaver, eller None hvis URL'en ikke har en host
+    """
+    if not url:
+        return None
+    try:
+        host = urlsplit(url).hostname
+    except ValueError:
+        return None
+    return host.lower() if host else None
+
+
+def classify_error(error_message: Optional[str]) -> str:
+    """
+    Inddeler en fejlbesked fra et download resultat i en fejlklasse.
+
+    Args:
+        error_message (str): Fejlbesked fra download resultatet
+
+    Returns:
+        str: En af ERROR_CLASSES, eller '' hvis der ikke er nogen fejl
+    """
+    if not error_message:
+        return ''
+    for name, pattern in ERROR_PATTERNS:
+        if pattern.search(error_message):
+            return name
+    return 'other'
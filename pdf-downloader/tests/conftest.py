@@ -0,0 +1,45 @@
+import pytest
+
+PDF_CONTENT = b'%PDF-test'
+
+class MockHistory:
+    def __init__(self, url):
+        self.url = url
+
+class MockResponse:
+    """Stand-in for et aiohttp svar med de felter PDFDownloader bruger"""
+    def __init__(self, status=200, content=None, content_type='application/pdf', url=None, history=()):
+        self.status = status
+        self._content = content if content else PDF_CONTENT
+        self.headers = {'content-type': content_type}
+        self.url = url
+        self.history = history
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        pass
+
+    async def read(self):
+        return self._content
+
+@pytest.fixture
+def mock_get(mocker):
+    """
+    Patcher aiohttp.ClientSession.get.
+
+    Fixturen kaldes med en handler der får URL'en og returnerer et MockResponse,
+    PDF indhold som bytes eller en undtagelse der skal kastes. Uden handler
+    svarer alle URLs med en PDF. Returnerer mocken, så kaldene kan tjekkes.
+    """
+    def install(handler=None):
+        async def get(url, **kwargs):
+            result = handler(url) if handler else None
+            if isinstance(result, BaseException):
+                raise result
+            if isinstance(result, MockResponse):
+                return result
+            return MockResponse(content=result, url=url)
+        return mocker.patch('aiohttp.ClientSession.get', side_effect=get)
+    return install
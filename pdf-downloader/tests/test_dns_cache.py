@@ -0,0 +1,106 @@
+import pytest
+import socket
+from src.dns_cache import CachingResolver
+
+class FakeResolver:
+    """Resolver der tæller opslag og kun kender example.com"""
+    def __init__(self):
+        self.calls = []
+    
+    async def resolve(self, host, port=0, family=socket.AF_INET):
+        self.calls.append(host)
+        if host != 'example.com':
+            raise socket.gaierror(socket.EAI_NONAME, 'Name or service not known')
+        return [{'hostname': host, 'host': '93.184.216.34', 'port': port,
+                 'family': socket.AF_INET, 'proto': 0, 'flags': 0}]
+    
+    async def close(self):
+        pass
+
+@pytest.mark.asyncio
+async def test_cache_reuses_lookup_with_new_port():
+    """Test at et cachet opslag genbruges og får den ønskede port"""
+    fake = FakeResolver()
+    resolver = CachingResolver(resolver=fake)
+    
+    first = await resolver.resolve('example.com', 80, socket.AF_UNSPEC)
+    second = await resolver.resolve('example.com', 443, socket.AF_UNSPEC)
+    
+    assert fake.calls == ['example.com']
+    assert first[0]['port'] == 80
+    assert second[0]['port'] == 443
+
+@pytest.mark.asyncio
+async def test_expired_entry_is_resolved_again():
+    """Test at opslag udløber efter TTL"""
+    fake = FakeResolver()
+    resolver = CachingResolver(ttl=0, resolver=fake)
+    
+    await resolver.resolve('example.com', 80, socket.AF_UNSPEC)
+    await resolver.resolve('example.com', 80, socket.AF_UNSPEC)
+    
+    assert fake.calls == ['example.com', 'example.com']
+
+@pytest.mark.asyncio
+async def test_pre_resolve_flags_nxdomain():
+    """Test at pre-resolve markerer ikke-eksisterende hosts og cacher fejlen"""
+    fake = FakeResolver()
+    resolver = CachingResolver(resolver=fake)
+    
+    failed = await resolver.pre_resolve(['example.com', 'nope.invalid', 'example.com'])
+    
+    assert failed == {'nope.invalid'}
+    with pytest.raises(OSError) as first:
+        await resolver.resolve('nope.invalid', 443, socket.AF_UNSPEC)
+    with pytest.raises(OSError) as second:
+        await resolver.resolve('nope.invalid', 443, socket.AF_UNSPEC)
+    assert fake.calls.count('nope.invalid') == 1
+    assert first.value is not second.value
+    assert first.value.__cause__ is second.value.__cause__
+    assert first.value.args == first.value.__cause__.args
+
+class FakeAsyncResolver(FakeResolver):
+    """Resolver der fejler som aiohttp's AsyncResolver: OSError uden errno"""
+    async def resolve(self, host, port=0, family=socket.AF_INET):
+        self.calls.append(host)
+        if host == 'slow.example.com':
+            raise OSError('Timeout while contacting DNS servers')
+        raise OSError(f'Domain name not found: {host}')
+
+def test_async_resolver_is_used_when_aiodns_is_installed(mocker, caplog):
+    """Test at aiodns bruges når det er installeret, og at fallback logges"""
+    mocker.patch('src.dns_cache.aiodns_default', True)
+    mocker.patch('src.dns_cache.AsyncResolver', FakeAsyncResolver)
+    assert isinstance(CachingResolver()._get_resolver(), FakeAsyncResolver)
+    assert 'aiodns' not in caplog.text
+    
+    mocker.patch('src.dns_cache.aiodns_default', False)
+    mocker.patch('src.dns_cache.ThreadedResolver', FakeResolver)
+    assert isinstance(CachingResolver()._get_resolver(), FakeResolver)
+    assert 'aiodns is not installed' in caplog.text
+
+@pytest.mark.asyncio
+async def test_async_resolver_errors_are_classified_by_message():
+    """Test at aiodns fejl uden errno kun markeres som NXDOMAIN når navnet ikke findes"""
+    resolver = CachingResolver(resolver=FakeAsyncResolver())
+    
+    failed = await resolver.pre_resolve(['nope.invalid', 'slow.example.com'])
+    
+    assert failed == {'nope.invalid'}
+
+@pytest.mark.asyncio
+async def test_downloader_skips_unresolvable_host(tmp_path, mocker):
+    """Test at downloaderen ikke forbinder til hosts der ikke findes"""
+    from src.downloader import PDFDownloader
+    get = mocker.patch('aiohttp.ClientSession.get')
+    downloader = PDFDownloader(str(tmp_path / "pdfs"), resolver=CachingResolver(resolver=FakeResolver()))
+    
+    results = await downloader.download_pdfs([{
+        'br_number': '12345',
+        'primary_url': 'http://nope.invalid/test.pdf',
+        'alternative_url': None
+    }])
+    
+    assert results[0]['status'] == 'failed'
+    assert 'DNS' in results[0]['error_message']
+    get.assert_not_called()
@@ -81,6 +81,48 @@ async def test_download_invalid_primary_valid_alternative(downloader, mocker):
     assert results[0]['status'] == 'success_alternative'
     assert (Path(downloader.output_dir) / '12345.pdf').exists()
 
+@pytest.mark.asyncio
+async def test_primary_timeout_falls_back_to_alternative(downloader, mocker):
+    """Test at en timeout på den primære URL ikke forhindrer forsøget på den alternative"""
+    async def mock_get(url, **kwargs):
+        if 'example.com' in url:
+            raise asyncio.TimeoutError()
+        return await mock_success(url, **kwargs)
+    
+    mocker.patch('aiohttp.ClientSession.get', side_effect=mock_get)
+    
+    urls = [{
+        'br_number': '12345',
+        'primary_url': 'http://example.com/test.pdf',
+        'alternative_url': 'http://backup.com/test.pdf'
+    }]
+    
+    results = await downloader.download_pdfs(urls)
+    
+    assert results[0]['status'] == 'success_alternative'
+    assert (Path(downloader.output_dir) / '12345.pdf').exists()
+
+@pytest.mark.asyncio
+async def test_errors_from_both_urls_are_reported(downloader, mocker):
+    """Test at fejl fra både primær og alternativ URL kommer med i fejlbeskeden"""
+    async def mock_get(url, **kwargs):
+        if 'example.com' in url:
+            raise asyncio.TimeoutError()
+        raise aiohttp.ClientError("Network error")
+    
+    mocker.patch('aiohttp.ClientSession.get', side_effect=mock_get)
+    
+    urls = [{
+        'br_number': '12345',
+        'primary_url': 'http://example.com/test.pdf',
+        'alternative_url': 'http://backup.com/test.pdf'
+    }]
+    
+    results = await downloader.download_pdfs(urls)
+    
+    assert results[0]['status'] == 'failed'
+    assert results[0]['error_message'] == 'TimeoutError; Network error'
+
 @pytest.mark.asyncio
 async def test_download_non_pdf_content(downloader, mocker):
     mocker.patch('aiohttp.ClientSession.get', side_effect=mock_non_pdf)
@@ -137,3 +179,19 @@ async def test_concurrent_downloads(downloader, mocker):
     # Check that exactly 5 files were created
     pdf_files = list(Path(downloader.output_dir).glob('*.pdf'))
     assert len(pdf_files) == 5
+
+@pytest.mark.asyncio
+async def test_storage_error_marks_download_failed(downloader, mocker):
+    """Test at en fejl ved skrivning af PDF'en giver 'failed' med fejlbeskeden"""
+    mocker.patch('aiohttp.ClientSession.get', side_effect=mock_success)
+    mocker.patch.object(downloader, '_save_pdf', side_effect=OSError("No space left on device"))
+    
+    results = await downloader.download_pdfs([{
+        'br_number': '12345',
+        'primary_url': 'http://example.com/test.pdf',
+        'alternative_url': None
+    }])
+    
+    assert results[0]['status'] == 'failed'
+    assert 'No space left on device' in results[0]['error_message']
+    assert results[0].get('sha256') is None
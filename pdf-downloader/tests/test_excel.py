@@ -103,3 +103,42 @@ def test_save_metadata(excel_handler, tmp_path):
     saved_df = pd.read_excel(output_path)
     assert 'Download Status' in saved_df.columns
     assert len(saved_df) == 1
+
+def test_save_metadata_csv(excel_handler, tmp_path):
+    """Test at metadata gemmes som CSV når endelsen er .csv"""
+    output_path = tmp_path / "metadata_output.csv"
+    download_results = [{
+        'br_number': 'BR50042',
+        'status': 'success',
+        'primary_url': 'http://test2.com',
+        'alternative_url': 'http://alt2.com'
+    }]
+    
+    metadata_df = excel_handler.generate_metadata(download_results)
+    excel_handler.save_metadata(metadata_df, str(output_path))
+    
+    saved_df = pd.read_csv(output_path)
+    assert list(saved_df['BRnum']) == ['BR50042']
+    assert saved_df.iloc[0]['Download Status'] == 'Downloadet'
+
+def test_save_metadata_parquet_with_mixed_types(tmp_path):
+    """Test at parquet metadata kan gemmes når en kolonne blander tal og tekst"""
+    file_path = tmp_path / "mixed.xlsx"
+    pd.DataFrame({
+        **TEST_DATA,
+        'Year': [2015, 'ukendt', None]
+    }).to_excel(file_path, index=False)
+    handler = ExcelHandler(str(file_path))
+    output_path = tmp_path / "metadata_output.parquet"
+    download_results = [
+        {'br_number': br_number, 'status': 'success', 'primary_url': None, 'alternative_url': None}
+        for br_number in TEST_DATA['BRnum']
+    ]
+
+    metadata_df = handler.generate_metadata(download_results)
+    handler.save_metadata(metadata_df, str(output_path))
+
+    saved_df = pd.read_parquet(output_path)
+    assert list(saved_df['Year'][:2]) == ['2015', 'ukendt']
+    assert pd.isna(saved_df['Year'][2])
+    assert saved_df.iloc[0]['Download Status'] == 'Downloadet'
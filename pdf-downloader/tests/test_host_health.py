@@ -0,0 +1,72 @@
+import pytest
+import aiohttp
+from pathlib import Path
+from src.host_health import HostHealthTracker
+from src.downloader import PDFDownloader
+
+@pytest.fixture
+def tracker(tmp_path):
+    """Opretter en HostHealthTracker med lav tærskel"""
+    return HostHealthTracker(str(tmp_path / "host_health.json"), failure_threshold=2, cooldown=60)
+
+def test_circuit_opens_after_threshold(tracker):
+    """Test at breakeren åbner efter N fortløbende fejl"""
+    tracker.record_failure('dead.com')
+    assert tracker.allow_request('dead.com')
+    
+    tracker.record_failure('dead.com')
+    assert tracker.state('dead.com') == 'open'
+    assert not tracker.allow_request('dead.com')
+
+def test_success_resets_failures(tracker):
+    """Test at en succes nulstiller fejltælleren"""
+    tracker.record_failure('flaky.com')
+    tracker.record_success('flaky.com')
+    tracker.record_failure('flaky.com')
+    assert tracker.state('flaky.com') == 'closed'
+
+def test_half_open_allows_single_probe(tracker):
+    """Test at kun én probe slippes igennem efter cooldown"""
+    tracker.record_failure('dead.com')
+    tracker.record_failure('dead.com')
+    tracker.hosts['dead.com']['opened_at'] -= 61
+    
+    assert tracker.allow_request('dead.com')
+    assert not tracker.allow_request('dead.com')
+    
+    # Fejlet probe åbner breakeren igen
+    tracker.record_failure('dead.com')
+    assert tracker.state('dead.com') == 'open'
+
+def test_state_persists_and_prioritizes(tracker):
+    """Test at tilstanden gemmes og døde hosts sorteres sidst"""
+    tracker.record_failure('dead.com')
+    tracker.record_failure('dead.com')
+    tracker.save()
+    
+    reloaded = HostHealthTracker(str(tracker.state_file))
+    assert reloaded.hosts['dead.com']['state'] == 'open'
+    
+    urls = [
+        {'br_number': '1', 'primary_url': 'http://dead.com/a.pdf', 'alternative_url': None},
+        {'br_number': '2', 'primary_url': 'http://alive.com/b.pdf', 'alternative_url': None}
+    ]
+    assert [u['br_number'] for u in reloaded.prioritize(urls)] == ['2', '1']
+
+@pytest.mark.asyncio
+async def test_open_circuit_skips_to_alternative(tracker, tmp_path, mock_get):
+    """Test at en død primær host springes over og alternativ URL bruges"""
+    get = mock_get(lambda url: aiohttp.ClientConnectionError("Connection refused") if 'dead.com' in url else None)
+    tracker.record_failure('dead.com')
+    tracker.record_failure('dead.com')
+    
+    downloader = PDFDownloader(str(tmp_path / "pdfs"), host_health=tracker)
+    results = await downloader.download_pdfs([{
+        'br_number': '12345',
+        'primary_url': 'http://dead.com/test.pdf',
+        'alternative_url': 'http://backup.com/test.pdf'
+    }])
+    
+    assert results[0]['status'] == 'success_alternative'
+    assert all('dead.com' not in call.args[0] for call in get.call_args_list)
+    assert (Path(downloader.output_dir) / '12345.pdf').exists()
@@ -0,0 +1,83 @@
+import pytest
+import asyncio
+import hashlib
+from pathlib import Path
+from src.io_stage import IOStage, LoopLagMonitor, pdf_excerpt, validate_pdf_structure
+from src.downloader import PDFDownloader
+
+VALID_PDF = b'%PDF-1.4\n1 0 obj\n<<>>\nendobj\nxref\n0 1\nstartxref\n9\n%%EOF\n'
+
+@pytest.mark.asyncio
+async def test_save_writes_file_and_returns_sha256(tmp_path):
+    """Test at filen skrives i blokke og sha256 beregnes korrekt"""
+    stage = IOStage(max_workers=2, buffer_size=8)
+    target = tmp_path / "test.pdf"
+    
+    digest = await stage.save(VALID_PDF, target)
+    stage.close()
+    
+    assert target.read_bytes() == VALID_PDF
+    assert digest == hashlib.sha256(VALID_PDF).hexdigest()
+    assert not Path(f"{target}.part").exists()
+
+def test_validate_pdf_structure():
+    """Test det lette PDF strukturtjek"""
+    assert validate_pdf_structure(VALID_PDF)
+    assert not validate_pdf_structure(b'<html>not a pdf</html>')
+    assert not validate_pdf_structure(b'%PDF-1.4 truncated')
+
+def test_pdf_excerpt_keeps_validation_result():
+    """Test at kun start og slutning sendes videre, med samme resultat som hele filen"""
+    large = VALID_PDF[:9] + b'0' * 100000 + VALID_PDF[9:]
+    truncated = large[:-10]
+    
+    assert len(pdf_excerpt(large)) == 1024 + 2048
+    assert pdf_excerpt(VALID_PDF) == VALID_PDF
+    assert validate_pdf_structure(pdf_excerpt(large))
+    assert not validate_pdf_structure(pdf_excerpt(truncated))
+    assert not validate_pdf_structure(pdf_excerpt(b'0' * 2000 + VALID_PDF))
+
+@pytest.mark.asyncio
+async def test_validation_only_when_enabled():
+    """Test at validering kun afviser indhold når den er slået til"""
+    disabled = IOStage()
+    enabled = IOStage(validate_pdfs=True)
+    
+    assert await disabled.validate(b'%PDF-test')
+    assert not await enabled.validate(b'%PDF-test')
+    assert await enabled.validate(VALID_PDF)
+    disabled.close()
+    enabled.close()
+
+@pytest.mark.asyncio
+async def test_downloader_records_sha256(tmp_path, mock_get):
+    """Test at downloaderen bruger io stage og gemmer sha256 i resultatet"""
+    mock_get(lambda url: VALID_PDF)
+    stage = IOStage(validate_pdfs=True)
+    downloader = PDFDownloader(str(tmp_path / "pdfs"), io_stage=stage)
+    
+    results = await downloader.download_pdfs([{
+        'br_number': '12345',
+        'primary_url': 'http://example.com/test.pdf',
+        'alternative_url': None
+    }])
+    stage.close()
+    
+    assert results[0]['status'] == 'success'
+    assert results[0]['sha256'] == hashlib.sha256(VALID_PDF).hexdigest()
+    assert (Path(downloader.output_dir) / '12345.pdf').read_bytes() == VALID_PDF
+
+@pytest.mark.asyncio
+async def test_loop_lag_monitor_detects_blocking():
+    """Test at en blokerende operation giver målbar loop forsinkelse"""
+    import time
+    monitor = LoopLagMonitor(interval=0.01)
+    monitor.start()
+    await asyncio.sleep(0.02)
+    time.sleep(0.05)
+    await asyncio.sleep(0.02)
+    await monitor.stop()
+    
+    stats = monitor.snapshot()
+    assert stats['samples'] > 0
+    assert stats['max_ms'] >= 30
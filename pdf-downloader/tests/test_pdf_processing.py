@@ -0,0 +1,91 @@
+import pytest
+import zlib
+import pandas as pd
+from src.pdf_processing import extract_pdf_info, PDFProcessingStage
+from src.excel_handler import ExcelHandler
+
+def make_pdf(text, compress=False, version='1.4'):
+    """Bygger en minimal PDF med én side og en tekst stream"""
+    stream = f'BT /F1 12 Tf 72 720 Td ({text}) Tj ET'.encode()
+    if compress:
+        stream = zlib.compress(stream)
+    return (
+        f'%PDF-{version}\n'.encode()
+        + b'1 0 obj << /Type /Catalog /Pages 2 0 R >> endobj\n'
+        + b'2 0 obj << /Type /Pages /Kids [3 0 R] /Count 1 >> endobj\n'
+        + b'3 0 obj << /Type /Page /Parent 2 0 R /Contents 4 0 R >> endobj\n'
+        + f'4 0 obj << /Length {len(stream)} >>\nstream\n'.encode() + stream + b'\nendstream\nendobj\n'
+        + b'trailer << /Root 1 0 R >>\nstartxref\n0\n%%EOF\n'
+    )
+
+@pytest.mark.parametrize('compress', [False, True])
+def test_extract_pdf_info(compress):
+    """Test udtræk af version, sideantal, kryptering og tekst"""
+    info = extract_pdf_info(make_pdf('Annual Report 2015', compress=compress, version='1.6'))
+    
+    assert info['pdf_version'] == '1.6'
+    assert info['page_count'] == 1
+    assert info['encrypted'] is False
+    assert 'Annual Report 2015' in info['first_page_text']
+
+def test_page_count_fallback_without_pypdf(mocker):
+    """Test at den simple parser ikke gætter på sideantallet"""
+    mocker.patch('src.pdf_processing.pypdf', None)
+    pdf = make_pdf('Report')
+    updated = pdf + b'3 0 obj << /Type /Page /Parent 2 0 R /Rotate 90 >> endobj\n%%EOF\n'
+    object_stream = (b'%PDF-1.5\n1 0 obj << /Type /ObjStm /N 3 /First 10 /Filter /FlateDecode >>\n'
+                     b'stream\nx\nendstream\nendobj\n%%EOF\n')
+    
+    assert extract_pdf_info(pdf)['page_count'] == 1
+    assert extract_pdf_info(updated)['page_count'] == 1
+    assert extract_pdf_info(object_stream)['page_count'] is None
+    assert extract_pdf_info(b'%PDF-1.4\n%%EOF\n')['page_count'] is None
+
+@pytest.mark.asyncio
+async def test_stage_processes_in_pool():
+    """Test at stagen behandler PDFs i procespuljen og samler resultaterne"""
+    stage = PDFProcessingStage(processes=1, max_pending=1)
+    await stage.submit('BR1', make_pdf('First'))
+    await stage.submit('BR2', make_pdf('Second'))
+    await stage.drain()
+    stage.close()
+    
+    assert 'First' in stage.results['BR1']['first_page_text']
+    assert stage.results['BR2']['page_count'] == 1
+
+def test_generate_metadata_adds_pdf_info(tmp_path):
+    """Test at PDF information tilføjes som ekstra metadata kolonner"""
+    df = pd.DataFrame({
+        'BRnum': ['BR1', 'BR2'],
+        'Pdf_URL': ['http://a.com/1.pdf', 'http://a.com/2.pdf'],
+        'Report Html Address': [None, None]
+    })
+    file_path = tmp_path / "test.xlsx"
+    df.to_excel(file_path, index=False)
+    
+    results = [{'br_number': 'BR1', 'status': 'success'}, {'br_number': 'BR2', 'status': 'failed'}]
+    pdf_info = {'BR1': extract_pdf_info(make_pdf('Hello'))}
+    metadata_df = ExcelHandler(str(file_path)).generate_metadata(results, pdf_info=pdf_info)
+    
+    rows = metadata_df.set_index('BRnum')
+    assert rows.loc['BR1', 'Page Count'] == 1
+    assert rows.loc['BR1', 'PDF Version'] == '1.4'
+    assert pd.isna(rows.loc['BR2', 'Page Count'])
+
+@pytest.mark.asyncio
+async def test_downloader_submits_saved_pdfs(tmp_path, mock_get):
+    """Test at downloaderen sender hver gemt PDF videre til stagen"""
+    from src.downloader import PDFDownloader
+    
+    mock_get(lambda url: make_pdf('Downloaded'))
+    stage = PDFProcessingStage(processes=1)
+    downloader = PDFDownloader(str(tmp_path / "pdfs"), post_processor=stage)
+    
+    await downloader.download_pdfs([{
+        'br_number': '12345',
+        'primary_url': 'http://example.com/test.pdf',
+        'alternative_url': None
+    }])
+    stage.close()
+    
+    assert 'Downloaded' in stage.results['12345']['first_page_text']
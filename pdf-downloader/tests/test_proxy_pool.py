@@ -0,0 +1,270 @@
+import pytest
+import pytest_asyncio
+import asyncio
+import socket
+import time
+import pandas as pd
+from aiohttp import web
+from src.proxy_pool import ProxyPool, load_proxy_list
+from src.downloader import PDFDownloader
+from src.status_tracker import StatusTracker
+from src.host_health import HostHealthTracker, CLOSED, OPEN
+
+PDF_CONTENT = b'%PDF-1.4 test'
+
+async def start_stand_in_proxy(name, seen):
+    """
+    Starter en lokal HTTP server der optræder som proxy. Den svarer selv på
+    requests i absolute-form og noterer hvilken host der blev bedt om.
+    """
+    async def handler(request):
+        seen.append((name, request.host))
+        return web.Response(body=PDF_CONTENT, content_type='application/pdf')
+
+    app = web.Application()
+    app.router.add_route('*', '/{tail:.*}', handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    return runner, f"http://127.0.0.1:{runner.addresses[0][1]}"
+
+async def start_connect_rejecting_proxy(status, reason):
+    """
+    Starter en stand-in proxy der svarer alle CONNECT requests med en fejlstatus,
+    ligesom en rigtig proxy gør når target hosten ikke kan nås.
+    """
+    async def handle(reader, writer):
+        await reader.readuntil(b'\r\n\r\n')
+        writer.write(f"HTTP/1.1 {status} {reason}\r\nContent-Length: 0\r\n\r\n".encode())
+        await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(handle, '127.0.0.1', 0)
+    return server, f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+
+async def start_hanging_proxy():
+    """
+    Starter en stand-in proxy der accepterer forbindelsen men aldrig svarer.
+    """
+    writers = []
+
+    async def handle(reader, writer):
+        writers.append(writer)
+        await asyncio.sleep(3600)
+
+    server = await asyncio.start_server(handle, '127.0.0.1', 0)
+    return server, writers, f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+
+def unused_port_url():
+    """Returnerer en proxy URL hvor der ikke lytter noget"""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return f"http://127.0.0.1:{sock.getsockname()[1]}"
+
+@pytest_asyncio.fixture
+async def stand_in_proxies():
+    """Starter to lokale stand-in proxies"""
+    seen = []
+    first_runner, first_url = await start_stand_in_proxy('first', seen)
+    second_runner, second_url = await start_stand_in_proxy('second', seen)
+    yield first_url, second_url, seen
+    await first_runner.cleanup()
+    await second_runner.cleanup()
+
+def make_urls(count, host='reports.example.test', scheme='http'):
+    return [
+        {'br_number': f'BR{i}', 'primary_url': f'{scheme}://{host}/{i}.pdf', 'alternative_url': None}
+        for i in range(count)
+    ]
+
+def test_least_loaded_picks_proxy_with_fewest_active_requests():
+    """Test at least_loaded spreder samtidige requests"""
+    pool = ProxyPool(['http://a:1', 'http://b:1', 'http://c:1'])
+
+    chosen = [pool.acquire('host').url for _ in range(3)]
+
+    assert sorted(chosen) == ['http://a:1', 'http://b:1', 'http://c:1']
+
+def test_sticky_keeps_host_on_same_proxy():
+    """Test at sticky bruger samme proxy pr. host og skifter når den tages ud"""
+    pool = ProxyPool(['http://a:1', 'http://b:1'], policy='sticky', max_failures=1)
+
+    first = pool.acquire('one.example.com')
+    pool.release(first, 0.1)
+    other = pool.acquire('two.example.com')
+    pool.release(other, 0.1)
+    again = pool.acquire('one.example.com')
+
+    assert again is first
+    assert other is not first
+
+    pool.release(again, 0.1, error=True, proxy_failure=True)
+    assert pool.acquire('one.example.com') is other
+
+def test_failing_proxy_is_dropped_and_returns_after_cooldown():
+    """Test at en proxy tages ud efter max_failures i træk og kommer tilbage efter cooldown"""
+    pool = ProxyPool(['http://a:1', 'http://b:1'], max_failures=2, cooldown=60)
+    bad, good = pool.proxies
+
+    def fail(proxy):
+        proxy.active += 1
+        pool.release(proxy, 0.1, error=True, proxy_failure=True)
+
+    fail(bad)
+    bad.active += 1
+    pool.release(bad, 0.1)
+    fail(bad)
+    assert bad.available(time.monotonic())
+
+    fail(bad)
+    assert not bad.available(time.monotonic())
+    assert pool.acquire() is good
+    assert pool.acquire() is good
+
+    bad.down_until = time.monotonic() - 1
+    assert pool.acquire() is bad
+    assert bad.stats()['proxy_failures'] == 3
+
+def test_all_proxies_down_uses_first_to_return():
+    """Test at puljen stadig returnerer en proxy når alle er ude"""
+    pool = ProxyPool(['http://a:1', 'http://b:1'])
+    now = time.monotonic()
+    pool.proxies[0].down_until = now + 100
+    pool.proxies[1].down_until = now + 10
+
+    assert pool.acquire() is pool.proxies[1]
+
+def test_pool_validation(tmp_path):
+    """Test fejl ved tom pulje og ukendt policy samt indlæsning fra fil"""
+    with pytest.raises(ValueError):
+        ProxyPool([])
+    with pytest.raises(ValueError):
+        ProxyPool(['http://a:1'], policy='random')
+
+    proxy_file = tmp_path / "proxies.txt"
+    proxy_file.write_text("# egress\nhttp://a:1\n\nhttp://b:1\n")
+    assert load_proxy_list(str(proxy_file)) == ['http://a:1', 'http://b:1']
+
+@pytest.mark.asyncio
+async def test_downloads_are_spread_across_proxies(tmp_path, stand_in_proxies):
+    """Test at downloads går gennem begge proxies med hver sin connector"""
+    first_url, second_url, seen = stand_in_proxies
+    pool = ProxyPool([first_url, second_url])
+    downloader = PDFDownloader(str(tmp_path / "pdfs"), max_concurrent=4, proxy_pool=pool)
+
+    results = await downloader.download_pdfs(make_urls(4), limit=4)
+
+    assert all(r['status'] == 'success' for r in results)
+    assert {name for name, _ in seen} == {'first', 'second'}
+    assert all(host == 'reports.example.test' for _, host in seen)
+    stats = {row['proxy']: row for row in pool.stats()}
+    assert stats[first_url]['requests'] + stats[second_url]['requests'] == 4
+    assert stats[first_url]['bytes'] > 0
+
+@pytest.mark.asyncio
+async def test_dead_proxy_is_dropped_from_pool(tmp_path, stand_in_proxies):
+    """Test at en proxy der ikke svarer tages ud, så resten går gennem den raske"""
+    first_url, _, seen = stand_in_proxies
+    dead_url = unused_port_url()
+    pool = ProxyPool([dead_url, first_url], max_failures=1, cooldown=60)
+    downloader = PDFDownloader(str(tmp_path / "pdfs"), max_concurrent=1, proxy_pool=pool)
+
+    results = await downloader.download_pdfs(make_urls(3), limit=3)
+
+    assert [r['status'] for r in results] == ['failed', 'success', 'success']
+    dead = pool.proxies[0]
+    assert dead.proxy_failures == 1
+    assert not dead.available(time.monotonic())
+    assert len(seen) == 2
+
+@pytest.mark.asyncio
+async def test_proxy_failures_do_not_open_host_circuit(tmp_path, stand_in_proxies):
+    """Test at proxy fejl ikke tælles mod target hostens circuit breaker"""
+    first_url, _, _ = stand_in_proxies
+    host_health = HostHealthTracker(failure_threshold=1)
+    pool = ProxyPool([unused_port_url(), first_url], max_failures=1)
+    downloader = PDFDownloader(str(tmp_path / "pdfs"), max_concurrent=1,
+                               host_health=host_health, proxy_pool=pool)
+
+    await downloader.download_pdfs(make_urls(2), limit=2)
+
+    assert host_health.state('reports.example.test') == CLOSED
+
+@pytest.mark.asyncio
+async def test_hanging_proxy_is_dropped_without_opening_host_circuit(tmp_path):
+    """Test at timeouts gennem en proxy der ikke svarer tæller mod proxyen og ikke mod hosten"""
+    server, writers, proxy_url = await start_hanging_proxy()
+    host_health = HostHealthTracker(failure_threshold=2)
+    pool = ProxyPool([proxy_url], max_failures=2, cooldown=60)
+    downloader = PDFDownloader(str(tmp_path / "pdfs"), max_concurrent=1, timeout=0.3,
+                               host_health=host_health, proxy_pool=pool)
+
+    results = await downloader.download_pdfs(make_urls(3), limit=3)
+    for writer in writers:
+        writer.close()
+    server.close()
+
+    assert all(r['status'] == 'failed' for r in results)
+    proxy = pool.proxies[0]
+    assert proxy.proxy_failures == 3
+    assert proxy.down_until > 0
+    assert host_health.state('reports.example.test') == CLOSED
+
+@pytest.mark.asyncio
+async def test_bad_gateway_counts_against_host_not_proxy(tmp_path):
+    """Test at 502 på CONNECT tæller mod target hosten og ikke mod proxyen"""
+    server, proxy_url = await start_connect_rejecting_proxy(502, 'Bad Gateway')
+    host_health = HostHealthTracker(failure_threshold=3)
+    pool = ProxyPool([proxy_url], max_failures=1)
+    downloader = PDFDownloader(str(tmp_path / "pdfs"), max_concurrent=1,
+                               host_health=host_health, proxy_pool=pool)
+
+    results = await downloader.download_pdfs(make_urls(3, scheme='https'), limit=3)
+    server.close()
+    await server.wait_closed()
+
+    assert all(r['status'] == 'failed' for r in results)
+    proxy = pool.proxies[0]
+    assert proxy.proxy_failures == 0
+    assert proxy.errors == 3
+    assert proxy.available(time.monotonic())
+    assert host_health.state('reports.example.test') == OPEN
+
+@pytest.mark.asyncio
+async def test_proxy_auth_failure_counts_against_proxy(tmp_path):
+    """Test at 407 på CONNECT tæller mod proxyen og ikke mod target hosten"""
+    server, proxy_url = await start_connect_rejecting_proxy(407, 'Proxy Authentication Required')
+    host_health = HostHealthTracker(failure_threshold=1)
+    pool = ProxyPool([proxy_url], max_failures=1)
+    downloader = PDFDownloader(str(tmp_path / "pdfs"), max_concurrent=1,
+                               host_health=host_health, proxy_pool=pool)
+
+    await downloader.download_pdfs(make_urls(1, scheme='https'), limit=1)
+    server.close()
+    await server.wait_closed()
+
+    assert pool.proxies[0].proxy_failures == 1
+    assert not pool.proxies[0].available(time.monotonic())
+    assert host_health.state('reports.example.test') == CLOSED
+
+def test_proxy_stats_in_status_report(tmp_path):
+    """Test at proxy statistik skrives ved siden af status rapporten"""
+    pool = ProxyPool(['http://a:1', 'http://b:1'])
+    proxy = pool.acquire()
+    pool.release(proxy, 0.5, nbytes=2048)
+    tracker = StatusTracker(str(tmp_path), report_format='csv')
+    tracker.update_batch([{
+        'br_number': 'BR1', 'status': 'success', 'primary_url': 'http://x.com',
+        'alternative_url': None, 'error_message': '', 'timestamp': '2025-03-27 20:00:00'
+    }])
+    tracker.update_proxy_stats(pool.stats())
+
+    tracker.generate_report()
+
+    stats_files = list(tmp_path.glob('proxy_stats_*.csv'))
+    assert len(stats_files) == 1
+    df = pd.read_csv(stats_files[0])
+    assert list(df['Proxy']) == ['http://a:1', 'http://b:1']
+    assert list(df['Requests']) == [1, 0]
+    assert df['KB/s'].iloc[0] == 4.0
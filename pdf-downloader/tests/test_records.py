@@ -0,0 +1,106 @@
+import time
+
+import pandas as pd
+import pytest
+
+from src.records import DownloadResult, DownloadStatus, UrlRecord
+from src.status_tracker import StatusTracker
+
+
+@pytest.fixture
+def url_record():
+    """Opretter en URL record uden år"""
+    return UrlRecord(br_number='BR50041', primary_url='http://test1.com/a.pdf', alternative_url=None)
+
+
+def test_url_record_dict_access(url_record):
+    """Test at UrlRecord kan bruges som de tidligere dictionaries"""
+    assert url_record['br_number'] == 'BR50041'
+    assert url_record['alternative_url'] is None
+    assert url_record.get('year') is None
+    assert 'year' not in url_record
+    assert url_record.to_dict() == {
+        'br_number': 'BR50041',
+        'primary_url': 'http://test1.com/a.pdf',
+        'alternative_url': None
+    }
+    with pytest.raises(KeyError):
+        url_record['unknown']
+
+    with_year = UrlRecord('BR1', None, 'http://alt.com', year='2023')
+    assert 'year' in with_year
+    assert with_year['year'] == '2023'
+
+
+def test_records_have_no_instance_dict(url_record):
+    """Test at records bruger slots i stedet for en dictionary pr. instans"""
+    result = DownloadResult(url_record)
+    assert not hasattr(url_record, '__dict__')
+    assert not hasattr(result, '__dict__')
+
+
+def test_download_result_shares_url_fields(url_record):
+    """Test at resultatet læser URL felterne fra URL recorden"""
+    result = DownloadResult(url_record, created_at=time.time())
+    assert result['br_number'] == 'BR50041'
+    assert result['primary_url'] is url_record.primary_url
+    assert result['alternative_url'] is None
+    assert result['status'] == 'failed'
+    assert result['error_message'] == ''
+    assert 'sha256' not in result
+
+
+def test_download_result_accepts_dict_url_info():
+    """Test at url_info også kan være en almindelig dictionary"""
+    result = DownloadResult({'br_number': 'BR1', 'primary_url': 'http://a.com', 'alternative_url': None})
+    assert result['br_number'] == 'BR1'
+
+
+def test_download_result_item_assignment(url_record):
+    """Test at status, fejlbesked og sha256 kan sættes som i en dictionary"""
+    result = DownloadResult(url_record)
+    result['status'] = 'success_alternative'
+    assert result.status is DownloadStatus.SUCCESS_ALTERNATIVE
+    assert result['status'] == 'success_alternative'
+
+    result['sha256'] = 'abc'
+    assert result['sha256'] == 'abc'
+
+    with pytest.raises(ValueError):
+        result['status'] = 'unknown'
+    with pytest.raises(KeyError):
+        result['br_number'] = 'BR2'
+
+
+def test_error_messages_are_interned(url_record):
+    """Test at ens fejlbeskeder deler samme streng"""
+    first = DownloadResult(url_record)
+    second = DownloadResult(url_record)
+    first['error_message'] = '; '.join(['HTTP 404', 'HTTP 503'])
+    second['error_message'] = '; '.join(['HTTP 404', 'HTTP 503'])
+    assert first.error_message is second.error_message
+    assert first.error_class == 'http_5xx'
+
+
+def test_timestamp_is_formatted(url_record):
+    """Test at tidspunktet formateres som i rapporterne"""
+    created_at = time.mktime((2025, 3, 27, 20, 0, 0, 0, 0, -1))
+    result = DownloadResult(url_record, created_at=created_at)
+    assert result['timestamp'] == '2025-03-27 20:00:00'
+
+
+def test_records_in_status_report(url_record, tmp_path):
+    """Test at status rapporten kan skrives direkte fra records"""
+    success = DownloadResult(url_record, created_at=time.time())
+    success['status'] = 'success'
+    failed = DownloadResult(UrlRecord('BR50042', 'http://test2.com', 'http://alt2.com'))
+    failed['error_message'] = 'Network error'
+
+    tracker = StatusTracker(str(tmp_path), report_format='csv')
+    tracker.update_batch([success, failed])
+    df = pd.read_csv(tracker.generate_report())
+
+    assert list(df['BR Nummer']) == ['BR50041', 'BR50042']
+    assert list(df['Status']) == ['success', 'failed']
+    assert df['Fejlbesked'].iloc[1] == 'Network error'
+    assert tracker.get_statistics()['success'] == 1
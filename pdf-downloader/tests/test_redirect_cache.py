@@ -0,0 +1,99 @@
+import pytest
+from src.redirect_cache import RedirectCache
+from src.downloader import PDFDownloader
+from .conftest import MockHistory, MockResponse
+
+URL_INFO = {
+    'br_number': '12345',
+    'primary_url': 'http://short.example.com/r/1',
+    'alternative_url': None
+}
+
+def test_cache_expiry_and_persistence(tmp_path):
+    """Test at entries gemmes mellem kørsler og udløber efter TTL"""
+    cache = RedirectCache(str(tmp_path / "redirects.json"))
+    cache.record('http://a.com/x', 'https://a.com/x', ['http://a.com/x', 'https://a.com/x'])
+    cache.record('https://b.com/y', 'https://b.com/y', ['https://b.com/y'])
+    cache.save()
+    
+    reloaded = RedirectCache(str(tmp_path / "redirects.json"))
+    assert reloaded.get('http://a.com/x') == 'https://a.com/x'
+    assert reloaded.get('https://b.com/y') is None
+    
+    reloaded.ttl = 0
+    reloaded.entries['http://a.com/x']['stored_at'] -= 1
+    assert reloaded.get('http://a.com/x') is None
+
+@pytest.mark.asyncio
+async def test_redirect_is_recorded_and_reused(tmp_path, mock_get):
+    """Test at den endelige URL gemmes og bruges direkte ved næste forsøg"""
+    final_url = 'https://cdn.example.com/reports/1.pdf'
+    get = mock_get(lambda url: MockResponse(url=final_url, history=(MockHistory(URL_INFO['primary_url']),)))
+    cache = RedirectCache()
+    downloader = PDFDownloader(str(tmp_path / "pdfs"), redirect_cache=cache)
+    
+    await downloader.download_pdfs([URL_INFO])
+    assert cache.entries[URL_INFO['primary_url']]['chain'] == [URL_INFO['primary_url'], final_url]
+    
+    results = await downloader.download_pdfs([URL_INFO])
+    assert results[0]['status'] == 'success'
+    assert get.call_args_list[-1].args[0] == final_url
+
+@pytest.mark.asyncio
+async def test_normalised_url_without_redirect_is_not_cached(tmp_path, mock_get):
+    """Test at en URL som aiohttp blot har normaliseret ikke gemmes som redirect"""
+    raw_url = 'http://Reports.Example.com:80/pdf/årsrapport 4.pdf'
+    mock_get(lambda url: MockResponse(url='http://reports.example.com/pdf/%C3%A5rsrapport%204.pdf'))
+    cache = RedirectCache()
+    downloader = PDFDownloader(str(tmp_path / "pdfs"), redirect_cache=cache)
+    
+    results = await downloader.download_pdfs([{'br_number': '1', 'primary_url': raw_url, 'alternative_url': None}])
+    
+    assert results[0]['status'] == 'success'
+    assert cache.entries == {}
+
+@pytest.mark.asyncio
+async def test_stale_redirect_falls_back_to_original(tmp_path, mock_get):
+    """Test at en død cachet URL fjernes og den oprindelige URL forsøges"""
+    get = mock_get(lambda url: MockResponse(404, url=url) if 'old-cdn' in url else None)
+    cache = RedirectCache()
+    cache.record(URL_INFO['primary_url'], 'https://old-cdn.example.com/1.pdf', [])
+    downloader = PDFDownloader(str(tmp_path / "pdfs"), redirect_cache=cache)
+    
+    results = await downloader.download_pdfs([URL_INFO])
+    
+    assert results[0]['status'] == 'success'
+    assert results[0]['error_message'] == ''
+    assert [call.args[0] for call in get.call_args_list] == [
+        'https://old-cdn.example.com/1.pdf', URL_INFO['primary_url']
+    ]
+    assert cache.get(URL_INFO['primary_url']) is None
+
+@pytest.mark.asyncio
+async def test_cached_redirect_is_used_when_source_host_is_down(tmp_path, mock_get):
+    """Test at en cachet endelig URL bruges selvom kilde hosten ikke resolver"""
+    get = mock_get()
+    cache = RedirectCache()
+    cache.record(URL_INFO['primary_url'], 'https://cdn.example.com/1.pdf', [])
+    downloader = PDFDownloader(str(tmp_path / "pdfs"), redirect_cache=cache)
+    downloader.unresolvable_hosts = {'short.example.com'}
+    
+    results = await downloader.download_pdfs([URL_INFO])
+    
+    assert results[0]['status'] == 'success'
+    assert [call.args[0] for call in get.call_args_list] == ['https://cdn.example.com/1.pdf']
+
+@pytest.mark.asyncio
+async def test_cached_redirect_respects_final_host_checks(tmp_path, mock_get):
+    """Test at DNS tjekket gælder den cachede URL's host, og entryen beholdes"""
+    get = mock_get()
+    cache = RedirectCache()
+    cache.record(URL_INFO['primary_url'], 'https://cdn.example.com/1.pdf', [])
+    downloader = PDFDownloader(str(tmp_path / "pdfs"), redirect_cache=cache)
+    downloader.unresolvable_hosts = {'cdn.example.com'}
+    
+    results = await downloader.download_pdfs([URL_INFO])
+    
+    assert results[0]['status'] == 'success'
+    assert [call.args[0] for call in get.call_args_list] == [URL_INFO['primary_url']]
+    assert cache.get(URL_INFO['primary_url']) == 'https://cdn.example.com/1.pdf'
@@ -0,0 +1,57 @@
+import pytest
+import pandas as pd
+from src.rerun import load_status_report, select_for_rerun
+from src.status_tracker import StatusTracker
+from src.excel_handler import ExcelHandler
+from src.utils import classify_error
+
+RESULTS = [
+    {'br_number': 'BR1', 'status': 'failed', 'primary_url': 'http://slow.com/1.pdf',
+     'alternative_url': None, 'error_message': 'TimeoutError', 'timestamp': '2025-03-27 20:00:00'},
+    {'br_number': 'BR2', 'status': 'failed', 'primary_url': 'http://broken.com/2.pdf',
+     'alternative_url': None, 'error_message': 'HTTP 503', 'timestamp': '2025-03-27 20:00:01'},
+    {'br_number': 'BR3', 'status': 'failed', 'primary_url': 'http://gone.com/3.pdf',
+     'alternative_url': None, 'error_message': 'HTTP 404', 'timestamp': '2025-03-27 20:00:02'},
+    {'br_number': 'BR4', 'status': 'success', 'primary_url': 'http://slow.com/4.pdf',
+     'alternative_url': None, 'error_message': '', 'timestamp': '2025-03-27 20:00:03'}
+]
+
+def test_classify_error():
+    """Test at fejlbeskeder inddeles i fejlklasser"""
+    assert classify_error('TimeoutError') == 'timeout'
+    assert classify_error('HTTP 502') == 'http_5xx'
+    assert classify_error('HTTP 404; Non-PDF content (text/html)') == 'http_4xx'
+    assert classify_error('DNS lookup failed for host nope.invalid') == 'dns'
+    assert classify_error('Something odd') == 'other'
+    assert classify_error('') == ''
+
+def test_select_by_error_class_and_host():
+    """Test filtrering på fejlklasse og host"""
+    assert select_for_rerun(RESULTS, statuses=['failed'], error_classes=['timeout', 'http_5xx']) == ['BR1', 'BR2']
+    assert select_for_rerun(RESULTS, hosts=['slow.com']) == ['BR1', 'BR4']
+
+@pytest.mark.parametrize('report_format', ['xlsx', 'csv'])
+def test_load_status_report_roundtrip(tmp_path, report_format):
+    """Test at en genereret status rapport kan læses tilbage som resultater"""
+    tracker = StatusTracker(str(tmp_path), report_format=report_format)
+    tracker.update_batch(RESULTS)
+    report_path = tracker.generate_report()
+    
+    loaded = load_status_report(str(report_path))
+    assert [r['br_number'] for r in loaded] == ['BR1', 'BR2', 'BR3', 'BR4']
+    assert loaded[1]['error_message'] == 'HTTP 503'
+    assert select_for_rerun(loaded, statuses=['failed'], error_classes=['http_5xx']) == ['BR2']
+
+def test_get_urls_for_selected_br_numbers(tmp_path):
+    """Test at get_urls kun returnerer de valgte BR numre via indekset"""
+    df = pd.DataFrame({
+        'BRnum': [f'BR{i}' for i in range(1, 6)] + ['BR2'],
+        'Pdf_URL': [f'http://host{i}.com/{i}.pdf' for i in range(1, 7)],
+        'Report Html Address': [None] * 6
+    })
+    file_path = tmp_path / "test.xlsx"
+    df.to_excel(file_path, index=False)
+    
+    urls = ExcelHandler(str(file_path)).get_urls(br_numbers=['BR4', 'BR2', 'BR9'])
+    assert [u['br_number'] for u in urls] == ['BR2', 'BR4', 'BR2']
+    assert urls[2]['primary_url'] == 'http://host6.com/6.pdf'
@@ -108,3 +108,33 @@ def test_multiple_batches(status_tracker):
     # Verificér rækkefølge
     assert status_tracker.results[0]['br_number'] == 'BR50041'
     assert status_tracker.results[2]['br_number'] == 'BR50043'
+
+def test_generate_csv_report(tmp_report_dir):
+    """Test at status rapporten kan skrives som CSV i flere row groups"""
+    tracker = StatusTracker(tmp_report_dir, report_format='csv', row_group_size=2)
+    tracker.update_batch(TEST_RESULTS)
+    report_path = tracker.generate_report(xlsx_export=True)
+    
+    assert report_path.suffix == '.csv'
+    report_df = pd.read_csv(report_path)
+    assert list(report_df['BR Nummer']) == ['BR50041', 'BR50042', 'BR50043']
+    assert report_df.iloc[1]['Fejlbesked'] == 'Network error'
+    
+    # xlsx eksporten skrives ved siden af
+    assert len(list(Path(tmp_report_dir).glob('download_status_*.xlsx'))) == 1
+
+def test_generate_parquet_report(tmp_report_dir):
+    """Test at status rapporten kan skrives som Parquet"""
+    pytest.importorskip('pyarrow')
+    tracker = StatusTracker(tmp_report_dir, report_format='parquet')
+    tracker.update_batch(TEST_RESULTS)
+    report_path = tracker.generate_report()
+    
+    report_df = pd.read_parquet(report_path)
+    assert len(report_df) == len(TEST_RESULTS)
+    assert report_df.iloc[2]['Status'] == 'success_alternative'
+
+def test_invalid_report_format(tmp_report_dir):
+    """Test at et ukendt rapport format afvises"""
+    with pytest.raises(ValueError):
+        StatusTracker(tmp_report_dir, report_format='pdf')
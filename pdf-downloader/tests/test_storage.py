@@ -0,0 +1,103 @@
+import pytest
+import tarfile
+from pathlib import Path
+from src.storage import PDFStore
+from src.downloader import PDFDownloader
+
+def test_hash_layout_shards_directories(tmp_path):
+    """Test at hash layoutet fordeler filer i to niveauer af undermapper"""
+    store = PDFStore(str(tmp_path), layout='hash')
+    path = store.path_for('BR50041')
+    
+    assert path.name == 'BR50041.pdf'
+    assert len(path.relative_to(tmp_path).parts) == 3
+    assert path.parent.is_dir()
+
+def test_year_layout_is_found_through_index(tmp_path):
+    """Test at year layoutet registreres i indekset og kan slås op igen"""
+    store = PDFStore(str(tmp_path), layout='year')
+    path = store.path_for('BR50041', '2015')
+    path.write_bytes(b'%PDF-test')
+    store.record('BR50041', path)
+    store.close()
+    
+    reopened = PDFStore(str(tmp_path), layout='year')
+    assert reopened.locate('BR50041') == {'path': tmp_path / '2015' / 'BR50041.pdf'}
+    assert reopened.read('BR50041') == b'%PDF-test'
+    assert reopened.locate('BR99999') is None
+
+def test_packed_mode_rolls_shards_and_reads_by_offset(tmp_path):
+    """Test at pakkede PDFs ruller til nye shards og kan læses direkte via indekset"""
+    store = PDFStore(str(tmp_path), packed=True, shard_size=3000)
+    contents = {f'BR{i}': f'%PDF-{i}'.encode() * 200 for i in range(4)}
+    for br_number, content in contents.items():
+        store.add_packed(br_number, content)
+    store.close()
+    
+    shards = sorted(tmp_path.glob('pdfs-*.tar'))
+    assert len(shards) > 1
+    with tarfile.open(shards[0]) as tar:
+        assert tar.getnames()[0] == 'BR0.pdf'
+    
+    reopened = PDFStore(str(tmp_path), packed=True)
+    for br_number, content in contents.items():
+        assert reopened.read(br_number) == content
+
+@pytest.mark.asyncio
+async def test_downloader_writes_to_packed_store(tmp_path, mock_get):
+    """Test at downloaderen gemmer i shards når lageret er pakket"""
+    mock_get()
+    store = PDFStore(str(tmp_path / "pdfs"), packed=True)
+    downloader = PDFDownloader(str(tmp_path / "pdfs"), store=store)
+    
+    results = await downloader.download_pdfs([{
+        'br_number': '12345',
+        'primary_url': 'http://example.com/test.pdf',
+        'alternative_url': None
+    }])
+    store.close()
+    
+    assert results[0]['status'] == 'success'
+    assert 'sha256' in results[0]
+    assert not (Path(downloader.output_dir) / '12345.pdf').exists()
+    assert store.read('12345') == b'%PDF-test'
+
+def test_packed_index_lines_reach_disk_before_close(tmp_path):
+    """Test at indekslinjer skrives straks, så de ikke tabes hvis kørslen afbrydes"""
+    store = PDFStore(str(tmp_path), packed=True)
+    store.add_packed('BR1', b'%PDF-1.4 one')
+
+    index_lines = (tmp_path / 'index.jsonl').read_text().splitlines()
+    assert len(index_lines) == 1
+    assert '"BR1"' in index_lines[0]
+    store.close()
+
+@pytest.mark.asyncio
+async def test_cli_closes_store_when_download_fails(tmp_path, mocker):
+    """Test at en pakket shard afsluttes og indekset bevares når kørslen fejler"""
+    from src.cli import main, parse_arguments
+    excel_path = tmp_path / "urls.csv"
+    excel_path.write_text("BRnum,Pdf_URL,Report Html Address\nBR1,http://a.com/1.pdf,\n")
+    output_dir = tmp_path / "pdfs"
+    stores = []
+
+    async def failing_download(self, urls, limit=None, timeout=None):
+        # Referencen holder lageret i live, så det ikke lukkes af garbage collection
+        stores.append(self.store)
+        self.store.add_packed('BR1', b'%PDF-1.4 one')
+        raise RuntimeError("afbrudt")
+
+    mocker.patch('src.downloader.PDFDownloader.download_pdfs', failing_download)
+    args = parse_arguments([
+        '--excel', str(excel_path), '--output', str(output_dir),
+        '--report', str(tmp_path / "reports"), '--pack'
+    ])
+
+    with pytest.raises(RuntimeError):
+        await main(args)
+
+    assert PDFStore(str(output_dir), packed=True).read('BR1') == b'%PDF-1.4 one'
+    # En afsluttet tar fil ender med to nul-blokke
+    assert (output_dir / 'pdfs-00000.tar').read_bytes().endswith(b'\0' * 1024)
+    with tarfile.open(output_dir / 'pdfs-00000.tar') as archive:
+        assert archive.getnames() == ['BR1.pdf']
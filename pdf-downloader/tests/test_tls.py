@@ -0,0 +1,142 @@
+import pytest
+import pytest_asyncio
+import shutil
+import ssl
+import subprocess
+from types import SimpleNamespace
+import aiohttp
+from aiohttp import web
+from src.tls import ConnectionStats, ResumingSSLContext, _contexts, _handshake_totals, create_probe_context, create_ssl_context, host_matches
+from src.downloader import PDFDownloader
+from src.transports import Http2Transport
+from src.utils import classify_error
+
+PDF_CONTENT = b'%PDF-1.4 test'
+
+@pytest.fixture(scope='module')
+def certificate(tmp_path_factory):
+    """Opretter et selvsigneret certifikat for localhost"""
+    if shutil.which('openssl') is None:
+        pytest.skip("openssl er ikke installeret")
+    directory = tmp_path_factory.mktemp('cert')
+    cert, key = directory / 'cert.pem', directory / 'key.pem'
+    subprocess.run([
+        'openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-days', '1',
+        '-keyout', str(key), '-out', str(cert), '-subj', '/CN=localhost',
+        '-addext', 'subjectAltName=DNS:localhost'
+    ], check=True, capture_output=True)
+    return str(cert), str(key)
+
+@pytest_asyncio.fixture
+async def https_server(certificate):
+    """Starter en lokal HTTPS server der returnerer en PDF"""
+    async def handler(request):
+        return web.Response(body=PDF_CONTENT, content_type='application/pdf')
+
+    app = web.Application()
+    app.router.add_get('/report.pdf', handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    context.load_cert_chain(*certificate)
+    site = web.TCPSite(runner, 'localhost', 0, ssl_context=context)
+    await site.start()
+    port = runner.addresses[0][1]
+    yield f"https://localhost:{port}/report.pdf"
+    await runner.cleanup()
+
+def test_ssl_context_is_cached():
+    """Test at hver context kun bygges én gang og verificerer som default"""
+    context = create_ssl_context()
+
+    assert create_ssl_context() is context
+    assert context.verify_mode == ssl.CERT_REQUIRED
+    assert context.check_hostname
+    assert create_ssl_context(verify=False) is not context
+    assert create_ssl_context(verify=False).verify_mode == ssl.CERT_NONE
+    assert context.minimum_version == ssl.TLSVersion.TLSv1_2
+    # Uden verifikation gælder OpenSSL's standard, som ved aiohttp's ssl=False
+    assert create_ssl_context(verify=False).minimum_version == ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT).minimum_version
+
+def test_host_matches():
+    """Test præcise hosts og domænemønstre"""
+    patterns = ['old.example.com', '.legacy.dk', '*.gov.test']
+
+    assert host_matches('old.example.com', patterns)
+    assert not host_matches('new.example.com', patterns)
+    assert host_matches('legacy.dk', patterns)
+    assert host_matches('www.legacy.dk', patterns)
+    assert host_matches('a.b.gov.test', patterns)
+    assert not host_matches('notlegacy.dk', patterns)
+    assert not host_matches(None, patterns)
+
+@pytest.mark.asyncio
+async def test_self_signed_certificate_is_rejected(tmp_path, https_server):
+    """Test at certifikater verificeres som default"""
+    downloader = PDFDownloader(str(tmp_path / "pdfs"))
+    url_info = {'br_number': 'BR1', 'primary_url': https_server, 'alternative_url': None}
+
+    results = await downloader.download_pdfs([url_info])
+
+    assert results[0]['status'] == 'failed'
+    assert classify_error(results[0]['error_message']) == 'tls'
+
+@pytest.mark.asyncio
+async def test_insecure_host_skips_verification(tmp_path, https_server):
+    """Test at hosts på insecure_hosts hentes uden verifikation"""
+    downloader = PDFDownloader(str(tmp_path / "pdfs"), insecure_hosts=['localhost'])
+    url_info = {'br_number': 'BR1', 'primary_url': https_server, 'alternative_url': None}
+
+    results = await downloader.download_pdfs([url_info])
+
+    assert results[0]['status'] == 'success'
+    assert (tmp_path / "pdfs" / "BR1.pdf").read_bytes() == PDF_CONTENT
+
+@pytest.mark.asyncio
+async def test_tls_sessions_are_resumed(certificate, https_server):
+    """Test at en ny forbindelse til samme host genoptager TLS sessionen"""
+    context = ResumingSSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    context.load_verify_locations(certificate[0])
+
+    for _ in range(3):
+        # force_close giver en ny forbindelse og dermed et nyt handshake pr. request
+        connector = aiohttp.TCPConnector(ssl=context, force_close=True)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            async with session.get(https_server) as response:
+                assert await response.read() == PDF_CONTENT
+
+    assert context.full_handshakes == 1
+    assert context.resumed_handshakes == 2
+
+@pytest.mark.asyncio
+async def test_connection_stats_counts_reused_connections(tmp_path, https_server):
+    """Test at genbrugte keep-alive forbindelser tælles"""
+    stats = ConnectionStats()
+    downloader = PDFDownloader(str(tmp_path / "pdfs"), max_concurrent=1,
+                               insecure_hosts=['localhost'], connection_stats=stats)
+    urls = [
+        {'br_number': f'BR{i}', 'primary_url': https_server, 'alternative_url': None}
+        for i in range(3)
+    ]
+
+    await downloader.download_pdfs(urls)
+    snapshot = stats.snapshot()
+
+    assert snapshot['new_tls_connections'] == 1
+    assert snapshot['reused_tls_connections'] == 2
+    assert snapshot['full_handshakes'] == 1
+    assert snapshot['saved_handshake_ms'] > 0
+
+@pytest.mark.asyncio
+async def test_alpn_probe_is_not_counted_as_handshake(https_server, mocker):
+    """Test at ALPN proben bruger en almindelig context uden for handshake statistikken"""
+    mocker.patch('src.transports.httpx', SimpleNamespace(AsyncClient=lambda **kwargs: None, Limits=dict))
+    transport = Http2Transport()
+    before = _handshake_totals()
+    
+    assert not await transport.supports(https_server)
+    
+    assert transport.protocols['localhost'] == ''
+    assert _handshake_totals() == before
+    assert type(create_probe_context(('h2', 'http/1.1'))) is ssl.SSLContext
+    assert create_probe_context(('h2', 'http/1.1')) not in _contexts
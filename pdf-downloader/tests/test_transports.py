@@ -0,0 +1,157 @@
+import pytest
+from pathlib import Path
+from types import SimpleNamespace
+from src.transports import Http2Response, Http2Transport
+from src.downloader import PDFDownloader
+from .conftest import MockResponse
+from src.host_health import HostHealthTracker, OPEN
+
+class FakeTransportError(Exception):
+    pass
+
+class FakeHttpxResponse:
+    def __init__(self, url, content=b'%PDF-test', status_code=200):
+        self.status_code = status_code
+        self.headers = {'content-type': 'application/pdf'}
+        self.url = url
+        self.history = []
+        self.http_version = 'HTTP/2'
+        self.closed = False
+        self._content = content
+    
+    async def aread(self):
+        return self._content
+    
+    async def aclose(self):
+        self.closed = True
+
+class FakeAsyncClient:
+    """Stand-in for httpx.AsyncClient der noterer requests"""
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.requests = []
+        self.responses = []
+        self.error = None
+    
+    def build_request(self, method, url, timeout=None):
+        return SimpleNamespace(method=method, url=url, timeout=timeout)
+    
+    async def send(self, request, stream=False):
+        self.requests.append((request, stream))
+        if self.error:
+            raise self.error
+        response = FakeHttpxResponse(request.url)
+        self.responses.append(response)
+        return response
+    
+    async def aclose(self):
+        pass
+
+@pytest.fixture
+def fake_httpx(mocker):
+    """Erstatter httpx med en stand-in"""
+    fake = SimpleNamespace(
+        AsyncClient=FakeAsyncClient,
+        Limits=lambda **kwargs: kwargs,
+        TransportError=FakeTransportError
+    )
+    mocker.patch('src.transports.httpx', fake)
+    return fake
+
+@pytest.fixture
+def transport(fake_httpx):
+    """Opretter en Http2Transport med en stand-in for httpx"""
+    return Http2Transport(max_connections=7)
+
+def test_missing_h2_package_fails_at_startup(fake_httpx):
+    """Test at en manglende h2 pakke giver ImportError når transporten oprettes"""
+    def client_without_h2(**kwargs):
+        raise ImportError("Using http2=True, but the 'h2' package is not installed.")
+    fake_httpx.AsyncClient = client_without_h2
+    
+    with pytest.raises(ImportError, match='httpx\\[http2\\]'):
+        Http2Transport()
+
+@pytest.mark.asyncio
+async def test_get_streams_response_through_http2_client(transport):
+    """Test at get bygger en streamende request og tilpasser svaret til aiohttp"""
+    response = await transport.get('https://h2.example.com/a.pdf', timeout=12)
+    client = transport._client
+    
+    assert isinstance(response, Http2Response)
+    assert client.kwargs['http2'] and client.kwargs['follow_redirects']
+    assert client.kwargs['limits'] == {'max_connections': 7}
+    request, stream = client.requests[0]
+    assert (request.method, request.url, request.timeout, stream) == ('GET', 'https://h2.example.com/a.pdf', 12, True)
+    
+    async with response as r:
+        assert r.status == 200
+        assert r.headers['content-type'] == 'application/pdf'
+        assert r.url == 'https://h2.example.com/a.pdf'
+        assert r.http_version == 'HTTP/2'
+        assert await r.read() == b'%PDF-test'
+    assert client.responses[0].closed
+    
+    await transport.close()
+    assert transport._client is None
+
+@pytest.mark.asyncio
+async def test_http2_transport_errors_count_against_host(tmp_path, transport, mocker):
+    """Test at httpx transportfejl tæller mod hostens circuit breaker"""
+    mocker.patch.object(transport, 'supports', return_value=True)
+    transport._get_client().error = FakeTransportError("connection reset")
+    host_health = HostHealthTracker(failure_threshold=1)
+    downloader = PDFDownloader(str(tmp_path / "pdfs"), http2=transport, host_health=host_health)
+    
+    results = await downloader.download_pdfs([
+        {'br_number': '1', 'primary_url': 'https://h2.example.com/a.pdf', 'alternative_url': None}
+    ])
+    
+    assert results[0]['status'] == 'failed'
+    assert 'connection reset' in results[0]['error_message']
+    assert host_health.state('h2.example.com') == OPEN
+
+@pytest.mark.asyncio
+async def test_alpn_result_is_cached_per_host(transport, mocker):
+    """Test at ALPN proben kun køres én gang pr. host"""
+    probe = mocker.patch.object(transport, '_probe_alpn', return_value='h2')
+    
+    assert await transport.supports('https://example.com/a.pdf')
+    assert await transport.supports('https://example.com/b.pdf')
+    
+    probe.assert_called_once_with('example.com', 443)
+
+@pytest.mark.asyncio
+async def test_plain_http_and_http11_hosts_use_aiohttp(transport, mocker):
+    """Test at http URLs og hosts uden h2 ikke bruger HTTP/2"""
+    probe = mocker.patch.object(transport, '_probe_alpn', return_value='http/1.1')
+    
+    assert not await transport.supports('http://example.com/a.pdf')
+    assert not await transport.supports('https://old.example.com/a.pdf')
+    probe.assert_called_once_with('old.example.com', 443)
+
+@pytest.mark.asyncio
+async def test_downloader_routes_h2_hosts_to_http2_backend(tmp_path, mock_get):
+    """Test at downloaderen bruger HTTP/2 backenden for hosts der forhandler h2"""
+    class FakeHttp2:
+        def __init__(self):
+            self.urls = []
+        async def supports(self, url):
+            return 'h2.example.com' in url
+        async def get(self, url, timeout=None):
+            self.urls.append(url)
+            return MockResponse()
+    
+    aiohttp_get = mock_get()
+    http2 = FakeHttp2()
+    downloader = PDFDownloader(str(tmp_path / "pdfs"), http2=http2)
+    
+    results = await downloader.download_pdfs([
+        {'br_number': '1', 'primary_url': 'https://h2.example.com/a.pdf', 'alternative_url': None},
+        {'br_number': '2', 'primary_url': 'https://h1.example.com/b.pdf', 'alternative_url': None}
+    ])
+    
+    assert all(r['status'] == 'success' for r in results)
+    assert http2.urls == ['https://h2.example.com/a.pdf']
+    assert [call.args[0] for call in aiohttp_get.call_args_list] == ['https://h1.example.com/b.pdf']
+    assert (Path(downloader.output_dir) / '1.pdf').exists()